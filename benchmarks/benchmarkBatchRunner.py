@@ -0,0 +1,64 @@
+""" Compare the batch runner keeping its workers alive with starting a fresh worker per scene.
+
+    python benchmarks/benchmarkBatchRunner.py --scenes 16 --nodes 2000 --startup 1.0
+
+The mock start up of a worker sleeps `--startup` seconds, about what mayapy takes to load Maya and V-ray.
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(_root, "benchmarks", "mock"))
+sys.path.insert(0, os.path.join(_root, "benchmarks"))
+sys.path.insert(0, os.path.join(_root, "snippets"))
+
+import mockScene
+import maya.cmds as mc
+
+from vrayBatchRunner import DEFAULT_OPERATIONS, summarize, vrayBatchRunner
+
+
+def writeScenes(directory, scenes, nodes):
+    """ Save `scenes` mock scenes of `nodes` nodes, the workers open them with the mock `file` command. """
+    paths = []
+    for index in range(scenes):
+        mockScene.buildScene(nodes)
+        paths.append(mc.file(rename=os.path.join(directory, "scene{0}.mb".format(index))))
+        mc.file(save=True, force=True)
+    mc.file(new=True, force=True)
+    return paths
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scenes", type=int, default=16, help="The amount of scenes")
+    parser.add_argument("--nodes", type=int, default=2000, help="The size of each scene in nodes")
+    parser.add_argument("--startup", type=float, default=1.0, help="The seconds a worker takes to start")
+    parser.add_argument("-j", "--processes", type=int, default=4, help="The amount of worker processes")
+    args = parser.parse_args(argv)
+
+    os.environ["MOCK_MAYA_STARTUP"] = str(args.startup)
+    directory = tempfile.mkdtemp(prefix="benchmarkBatchRunner_")
+    try:
+        writeScenes(directory, args.scenes, args.nodes)
+        print "{0:<24} {1:>7} {2:>8} {3:>10} {4:>10}".format("workers", "scenes", "started", "start up", "seconds")
+        for name, scenes_per_worker in (("kept alive", None), ("one per scene", 1)):
+            start_time = time.time()
+            results = vrayBatchRunner([os.path.join(directory, "*.mb")], processes=args.processes,
+                                      scenes_per_worker=scenes_per_worker, dry_run=True, verbose=False)
+            duration = time.time() - start_time
+            summary = summarize(results, DEFAULT_OPERATIONS)
+            if summary["failures"]:
+                raise RuntimeError("Scenes failed: {0}".format(summary["failures"]))
+            print "{0:<24} {1:>7} {2:>8} {3:>10.2f} {4:>10.2f}".format(
+                name, summary["scenes"], summary["workers"], summary["startup"], duration)
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
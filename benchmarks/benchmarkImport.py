@@ -0,0 +1,51 @@
+""" Measure the import time of the snippets package against importing all snippet modules up front.
+
+    python benchmarks/benchmarkImport.py --repeats 20
+
+Every import is timed in a fresh Python process (with the mock `maya`), so nothing is cached between them.
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+# (name, the statements to time)
+IMPORTS = (
+    ("import snippets", "import snippets"),
+    ("snippets.tool(addVrayObjectIds)", "import snippets; snippets.tool('addVrayObjectIds')"),
+    ("snippets.tool(suppressRenderView)", "import snippets; snippets.tool('suppressRenderView')"),
+    ("import all modules", "import snippets; [getattr(snippets, name[:-3]) for name in sorted("
+                           "os.listdir(snippets.__path__[0])) if name.endswith('.py') and name[0] != '_']"),
+)
+
+_TIMER = """
+import os, sys, time
+sys.path[:0] = [{root!r}, {mock!r}]
+start_time = time.time()
+{statements}
+sys.stdout.write(repr(time.time() - start_time))
+"""
+
+
+def timeImport(statements):
+    """ Run the statements in a new Python process and return the seconds they took. """
+    script = _TIMER.format(root=_root, mock=os.path.join(_root, "benchmarks", "mock"), statements=statements)
+    return float(subprocess.check_output([sys.executable, "-c", script]))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeats", type=int, default=10, help="The amount of processes per import")
+    args = parser.parse_args(argv)
+
+    print "{0:<36} {1:>12} {2:>12}".format("import", "median (ms)", "min (ms)")
+    for name, statements in IMPORTS:
+        times = sorted(timeImport(statements) for repeat in range(args.repeats))
+        print "{0:<36} {1:>12.2f} {2:>12.2f}".format(name, times[len(times) // 2] * 1000, times[0] * 1000)
+
+
+if __name__ == "__main__":
+    main()
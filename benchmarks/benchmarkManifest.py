@@ -0,0 +1,68 @@
+""" Compare importing a V-ray attribute manifest with re-running the per node snippet loop on a rebuilt scene.
+
+    python benchmarks/benchmarkManifest.py --sizes 1000 10000 100000
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+
+_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(_root, "benchmarks", "mock"))
+sys.path.insert(0, os.path.join(_root, "benchmarks"))
+sys.path.insert(0, os.path.join(_root, "snippets"))
+
+import mockScene
+import maya.cmds as mc
+
+from benchmarkSnippets import measure
+from vrayAttributeGroups import addVrayAttributeGroup
+from vrayManifest import exportManifest, importManifest
+
+
+GROUPS = (("vray_subdivision", {"vraySubdivUVs": 0}), ("vray_objectID", {"vrayObjectID": 3}))
+
+
+def perNodeLoop(shapes):
+    """ What re-running the snippets by hand comes down to: a vray and setAttr call per node. """
+    for group, values in GROUPS:
+        for shape in shapes:
+            mc.vray("addAttributesFromGroup", shape, group, 1)
+            for attr, value in values.items():
+                mc.setAttr("{0}.{1}".format(shape, attr), value)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000],
+                        help="The scene sizes in nodes")
+    args = parser.parse_args(argv)
+
+    print "{0:<32} {1:>9} {2:>10} {3:>9} {4:>12}".format("benchmark", "nodes", "seconds", "calls", "mel commands")
+    directory = tempfile.mkdtemp(prefix="benchmarkManifest_")
+    try:
+        for nodes in args.sizes:
+            path = os.path.join(directory, "manifest{0}.json.gz".format(nodes))
+            mockScene.buildScene(nodes)
+            for group, values in GROUPS:
+                addVrayAttributeGroup(mc.ls(type="mesh", long=True), group, values)
+
+            results = [("exportManifest", measure(exportManifest, path, verbose=False)),
+                       ("importManifest (unchanged)", measure(importManifest, path, verbose=False))]
+
+            # A rebuilt scene has new uuids, so the nodes are found by name
+            mockScene.buildScene(nodes)
+            results.append(("importManifest (rebuilt)", measure(importManifest, path, verbose=False)))
+
+            mockScene.buildScene(nodes)
+            results.append(("per node loop (rebuilt)", measure(perNodeLoop, mc.ls(type="mesh", long=True))))
+
+            for name, (seconds, calls, mel_commands) in results:
+                print "{0:<32} {1:>9} {2:>10.3f} {3:>9} {4:>12}".format(name, nodes, seconds, calls, mel_commands)
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
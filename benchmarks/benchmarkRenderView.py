@@ -0,0 +1,110 @@
+""" Measure the memory and render start time the render view costs with each way of hiding it.
+
+This needs an interactive Maya session with V-ray as the current renderer (the mock has no render view), open
+a small scene and run it from the script editor:
+
+    import sys
+    sys.path.append("/path/to/repository/benchmarks")
+    import benchmarkRenderView
+    benchmarkRenderView.benchmarkRenderView()
+
+Each mode renders the current camera a few times at a 4K resolution. The render start time runs from the render
+command until Maya's pre render MEL runs (the render view is opened, resized and allocated before that) and the
+memory is the change in Maya's heap after the render, what the render view holds on to.
+"""
+import os
+import sys
+import time
+
+_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(_root, "snippets"))
+
+import maya.cmds as mc
+import maya.mel as mel
+
+from autoRenderViewMinimize import autoRenderViewMinimize
+from forceHideRenderView import forceHideRenderView
+from suppressRenderView import suppressRenderView
+from undoPolicies import heapMemory
+
+
+MODES = ("renderView", "forceHideRenderView", "autoRenderViewMinimize", "suppressRenderView")
+
+# The time the pre render MEL of the current render ran
+_started = []
+
+
+def _renderStarted():
+    _started.append(time.time())
+
+
+def _reset():
+    """ Disable all ways of hiding the render view and close it. """
+    suppressRenderView(False)
+    forceHideRenderView(False)
+    autoRenderViewMinimize(False)
+    if mc.window("renderViewWindow", q=1, exists=True):
+        mc.deleteUI("renderViewWindow")
+
+
+def _enable(mode):
+    if mode == "forceHideRenderView":
+        forceHideRenderView(True)
+    elif mode == "autoRenderViewMinimize":
+        autoRenderViewMinimize(True)
+    elif mode == "suppressRenderView":
+        suppressRenderView(True)
+
+
+def measureRender():
+    """ Render the current camera through the render button's command.
+
+    :rtype: (float, float, float)
+    :return: The render start time, the total render time (both in seconds) and the heap change in megabytes.
+    """
+    del _started[:]
+    memory_before = heapMemory()
+    start_time = time.time()
+    mel.eval("RenderIntoNewWindow")
+    end_time = time.time()
+    started = _started[0] if _started else end_time
+    return started - start_time, end_time - start_time, heapMemory() - memory_before
+
+
+def benchmarkRenderView(modes=MODES, resolution=(3840, 2160), repeats=3):
+    """ Render with each mode and print the mean render start time, render time and heap change.
+
+    :rtype: list of tuple
+    :return: Per mode the (mode, start seconds, render seconds, memory megabytes) means.
+    """
+    if mc.about(batch=True):
+        raise RuntimeError("The render view only exists in an interactive Maya session")
+
+    plugs = ("defaultResolution.width", "defaultResolution.height", "defaultRenderGlobals.preMel")
+    previous = [mc.getAttr(plug) for plug in plugs]
+    mc.setAttr("defaultResolution.width", resolution[0])
+    mc.setAttr("defaultResolution.height", resolution[1])
+    mc.setAttr("defaultRenderGlobals.preMel", 'python("import benchmarkRenderView; '
+                                              'benchmarkRenderView._renderStarted()")', type="string")
+
+    results = []
+    try:
+        for mode in modes:
+            _reset()
+            _enable(mode)
+            measurements = [measureRender() for repeat in range(repeats)]
+            results.append((mode,) + tuple(sum(values) / len(values) for values in zip(*measurements)))
+    finally:
+        _reset()
+        mc.setAttr(plugs[0], previous[0])
+        mc.setAttr(plugs[1], previous[1])
+        mc.setAttr(plugs[2], previous[2] or "", type="string")
+
+    print "{0:<24} {1:>12} {2:>12} {3:>12}".format("mode", "start (s)", "render (s)", "memory (MB)")
+    for mode, start, render, memory in results:
+        print "{0:<24} {1:>12.3f} {2:>12.3f} {3:>+12.1f}".format(mode, start, render, memory)
+    return results
+
+
+if __name__ == "__main__":
+    benchmarkRenderView()
@@ -0,0 +1,97 @@
+""" Benchmark the snippets against the mock `maya.cmds` on synthetic scenes of increasing size.
+
+Reports the wall time and the amount of Maya command calls (and the commands run through MEL batches).
+
+    python benchmarks/benchmarkSnippets.py --sizes 1000 10000 100000
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(_root, "benchmarks", "mock"))
+sys.path.insert(0, os.path.join(_root, "benchmarks"))
+sys.path.insert(0, os.path.join(_root, "snippets"))
+
+import mockScene
+from maya import _scene
+
+import addVrayMaterialIds
+import addVrayObjectIds
+import addVraySubdivisionAttributes
+import maFileCache
+import maSceneFile
+import shapeResolver
+import vrayFrameBufferFix
+import vraySettingsAudit
+
+
+def measure(function, *args, **kwargs):
+    """ Run `function` on the current mock scene.
+
+    :return: The wall time in seconds, the command calls and the commands run within MEL.
+    :rtype: (float, int, int)
+    """
+    scene = _scene.current
+    scene.resetStatistics()
+    start_time = time.time()
+    function(*args, **kwargs)
+    return time.time() - start_time, sum(scene.calls.values()), sum(scene.mel_commands.values())
+
+
+def benchmarkScene(nodes, instances=0):
+    """ Benchmark the snippets working on the scene, each on a freshly generated scene of `nodes` nodes. """
+    results = []
+    for name, function in (("resolveShapes", shapeResolver.resolveShapes),
+                           ("addVrayObjectIds", addVrayObjectIds.addVrayObjectIds),
+                           ("addVrayMaterialIds", addVrayMaterialIds.addVrayMaterialIds),
+                           ("addVraySubdivisionAttribute", addVraySubdivisionAttributes.addVraySubdivisionAttribute),
+                           ("vrayFrameBufferFixInMemory", vrayFrameBufferFix.vrayFrameBufferFixInMemory),
+                           ("compactSettings (save hook)", vraySettingsAudit.compactSettings)):
+        mockScene.buildScene(nodes, instances=instances)
+        results.append((name, nodes) + measure(function))
+    return results
+
+
+def benchmarkMaFile(nodes, directory):
+    """ Benchmark removing .vfbSA from a synthetic .ma file (plain and gzip compressed) of `nodes` nodes. """
+    results = []
+    for compress in (False, True):
+        path = os.path.join(directory, "scene{0}.ma{1}".format(nodes, ".gz" if compress else ""))
+        mockScene.writeMaFile(path, nodes, compress=compress)
+        name = "removeVfbSA" + (" (gzip)" if compress else "")
+        results.append((name, nodes) + measure(maSceneFile.removeVfbSA, path, verbose=False))
+
+        # A second run: scanning the fixed file against skipping it through the sidecar cache
+        file_cache = maFileCache.FileStateCache()
+        file_cache.record(path, maFileCache.FIXED)
+        file_cache.save()
+        results.append((name + " rescan", nodes) + measure(maSceneFile.containsVfbSA, path))
+        results.append((name + " cached", nodes) + measure(lambda: maFileCache.FileStateCache().lookup(path)))
+        os.remove(path)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000],
+                        help="The scene sizes in nodes (up to 1000000)")
+    parser.add_argument("--instances", type=int, default=0,
+                        help="The amount of extra instance paths of the shapes in each scene")
+    args = parser.parse_args(argv)
+
+    print "{0:<32} {1:>9} {2:>10} {3:>9} {4:>12}".format("benchmark", "nodes", "seconds", "calls", "mel commands")
+    directory = tempfile.mkdtemp(prefix="benchmarkSnippets_")
+    try:
+        for nodes in args.sizes:
+            for name, size, seconds, calls, mel_commands in benchmarkScene(nodes, args.instances) + benchmarkMaFile(nodes, directory):
+                print "{0:<32} {1:>9} {2:>10.3f} {3:>9} {4:>12}".format(name, size, seconds, calls, mel_commands)
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+""" Compare the time and memory change of adding V-ray attribute groups under each undo policy.
+
+The mock simulates the undo queue memory (a fixed size per undo entry), run it in Maya for real numbers.
+
+    python benchmarks/benchmarkUndoPolicies.py --sizes 1000 10000 100000
+"""
+import argparse
+import os
+import sys
+
+_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(_root, "benchmarks", "mock"))
+sys.path.insert(0, os.path.join(_root, "benchmarks"))
+sys.path.insert(0, os.path.join(_root, "snippets"))
+
+import mockScene
+import maya.cmds as mc
+
+from undoPolicies import UNDO_POLICIES, bulkAddVrayAttributeGroup
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000],
+                        help="The scene sizes in nodes")
+    args = parser.parse_args(argv)
+
+    print "{0:<8} {1:>9} {2:>10} {3:>12}".format("policy", "nodes", "seconds", "memory (MB)")
+    for nodes in args.sizes:
+        for policy in UNDO_POLICIES:
+            mockScene.buildScene(nodes)
+            shapes = mc.ls(type="mesh", long=True)
+            counts = bulkAddVrayAttributeGroup(shapes, "vray_objectID", {"vrayObjectID": 1}, undo=policy,
+                                               verbose=False)
+            print "{0:<8} {1:>9} {2:>10.3f} {3:>12.1f}".format(policy, nodes, counts["seconds"], counts["memory"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+""" In-process stand-in for the parts of Maya used by the snippets, backed by a synthetic scene graph.
+
+This is NOT Maya. It only implements the commands (and flags) the snippets and their helper modules use,
+so they can be benchmarked without a licensed Maya. See `benchmarks/mockScene.py` to generate scenes.
+"""
@@ -0,0 +1,199 @@
+import collections
+import itertools
+import os
+import pickle
+import tempfile
+import uuid as _uuid
+
+
+SHAPE_TYPES = frozenset(["mesh", "nurbsSurface", "nurbsCurve", "locator", "camera"])
+DAG_TYPES = SHAPE_TYPES | frozenset(["transform", "joint"])
+MATERIAL_TYPES = frozenset(["lambert", "blinn", "phong", "surfaceShader", "VRayMtl", "VRayBlendMtl"])
+
+# The attributes (with their default value) each V-ray attribute group adds, and the node types it applies to
+VRAY_ATTRIBUTE_GROUPS = {
+    "vray_subdivision": (("mesh", "nurbsSurface"),
+                         (("vraySubdivEnable", 1), ("vraySubdivUVs", 1), ("vraySubdivUVsAtBorders", 0),
+                          ("vrayStaticSubdiv", 0))),
+    "vray_subquality": (("mesh", "nurbsSurface"),
+                        (("vrayOverrideGlobalSubQual", 1), ("vrayViewDep", 1), ("vrayEdgeLength", 4.0),
+                         ("vrayMaxSubdivs", 256))),
+    "vray_displacement": (("mesh", "nurbsSurface"),
+                          (("vrayDisplacementNone", 0), ("vrayDisplacementType", 1), ("vrayDisplacementAmount", 1.0),
+                           ("vrayDisplacementShift", 0.0))),
+    "vray_objectID": (("mesh", "nurbsSurface", "nurbsCurve", "transform"), (("vrayObjectID", 0),)),
+    "vray_user_attributes": (("mesh", "nurbsSurface", "transform"), (("vrayUserAttributes", ""),)),
+    "vray_nurbscurve_renderable": (("nurbsCurve",),
+                                   (("vrayNurbsCurveRenderable", 1), ("vrayNurbsCurveWidth", 0.1))),
+    "vray_skip_export": (("transform",), (("vraySkipExport", 1),)),
+    "vray_material_id": (tuple(sorted(MATERIAL_TYPES)), (("vrayMaterialId", 0), ("vrayColorId", (0.0, 0.0, 0.0)))),
+}
+
+
+class Node(object):
+    __slots__ = ("name", "type", "uuid", "parents", "children", "attrs", "locked", "connections", "intermediate")
+
+    def __init__(self, name, node_type):
+        self.name = name
+        self.type = node_type
+        self.uuid = str(_uuid.uuid4()).upper()
+        self.parents = []
+        self.children = []
+        self.attrs = {}
+        self.locked = set()
+        # (attribute, other node, other attribute, whether this node is the source)
+        self.connections = []
+        self.intermediate = False
+
+    @property
+    def dag(self):
+        return self.type in DAG_TYPES
+
+    def paths(self):
+        """ All DAG paths to this node, one per instance. """
+        if not self.dag:
+            return [self.name]
+        if not self.parents:
+            return ["|" + self.name]
+        return ["{0}|{1}".format(path, self.name) for parent in self.parents for path in parent.paths()]
+
+
+class Scene(object):
+    """ The synthetic scene graph plus the statistics of the commands run on it. """
+    def __init__(self):
+        self.nodes = collections.OrderedDict()
+        self.uuids = {}
+        self.selection = []
+        self.path = ""
+        self.prompt_text = "1"
+        # The state of the progressWindow and whether the user pressed escape to cancel it
+        self.progress = {}
+        self.progress_cancelled = False
+        self.undo_enabled = True
+        self.undo_entries = 0
+        self.undo_chunks = 0
+        self.user_app_dir = os.path.join(tempfile.gettempdir(), "mockMaya") + os.sep
+        self.calls = collections.Counter()
+        self.mel_commands = collections.Counter()
+        self.in_mel = 0
+        self.callbacks = collections.defaultdict(dict)
+        self._callback_ids = itertools.count(1)
+
+    def resetStatistics(self):
+        self.calls.clear()
+        self.mel_commands.clear()
+
+    def uniqueName(self, name):
+        if name not in self.nodes:
+            return name
+        base = name.rstrip("0123456789")
+        for index in itertools.count(1):
+            candidate = "{0}{1}".format(base, index)
+            if candidate not in self.nodes:
+                return candidate
+
+    def createNode(self, node_type, name=None, parent=None):
+        node = Node(self.uniqueName(name or node_type + "1"), node_type)
+        self.nodes[node.name] = node
+        self.uuids[node.uuid] = node
+        if parent is not None:
+            self.parent(node, parent)
+        self.fire("nodeAdded", node)
+        return node
+
+    def parent(self, node, parent):
+        node.parents.append(parent)
+        parent.children.append(node)
+
+    def node(self, name):
+        """ Look up a node by name, (long) DAG path or uuid, None if it doesn't exist. """
+        return self.nodes.get(name.rsplit("|", 1)[-1]) or self.uuids.get(name)
+
+    def connect(self, src, src_attr, dst, dst_attr):
+        src.connections.append((src_attr, dst, dst_attr, True))
+        dst.connections.append((dst_attr, src, src_attr, False))
+        self.fire("connection", src, src_attr, dst, dst_attr, True)
+
+    def disconnect(self, src, src_attr, dst, dst_attr):
+        src.connections.remove((src_attr, dst, dst_attr, True))
+        dst.connections.remove((dst_attr, src, src_attr, False))
+        self.fire("connection", src, src_attr, dst, dst_attr, False)
+
+    def delete(self, node):
+        for attr, other, other_attr, is_source in list(node.connections):
+            if is_source:
+                self.disconnect(node, attr, other, other_attr)
+            else:
+                self.disconnect(other, other_attr, node, attr)
+        for child in list(node.children):
+            child.parents.remove(node)
+            if not child.parents:
+                self.delete(child)
+        for parent in node.parents:
+            parent.children.remove(node)
+        del self.nodes[node.name]
+        del self.uuids[node.uuid]
+        self.selection = [name for name in self.selection if self.node(name) is not None]
+        self.fire("nodeRemoved", node)
+
+    def rename(self, node, name):
+        previous = node.name
+        del self.nodes[previous]
+        node.name = self.uniqueName(name)
+        self.nodes[node.name] = node
+        self.fire("nameChanged", node, previous)
+        return node.name
+
+    def attributeChanged(self, node, attr, message):
+        """ Fire the attribute changed callbacks of the node, they're registered per node (by uuid). """
+        callbacks = self.callbacks.get(("attributeChanged", node.uuid))
+        if callbacks:
+            for function in list(callbacks.values()):
+                function(node, attr, message)
+
+    def addCallback(self, kind, function):
+        callback_id = next(self._callback_ids)
+        self.callbacks[kind][callback_id] = function
+        return callback_id
+
+    def removeCallback(self, callback_id):
+        for kind, callbacks in self.callbacks.items():
+            callbacks.pop(callback_id, None)
+            if not callbacks and isinstance(kind, tuple):
+                del self.callbacks[kind]
+
+    def fire(self, kind, *args):
+        for function in list(self.callbacks[kind].values()):
+            function(*args)
+
+    def clear(self):
+        """ Start a new empty scene (statistics and callbacks are kept). """
+        self.fire("sceneBeforeNew")
+        self.nodes.clear()
+        self.uuids.clear()
+        self.selection = []
+        self.path = ""
+        self.fire("sceneNew")
+
+    def save(self, path):
+        """ Write the scene graph to a file. It's a pickle, not a Maya scene, only `open` can read it. """
+        with open(path, "wb") as f:
+            pickle.dump((list(self.nodes.values()), self.selection), f, 2)
+        self.path = path
+
+    def open(self, path):
+        """ Replace the scene graph with one written by `save` (statistics and callbacks are kept). """
+        with open(path, "rb") as f:
+            nodes, selection = pickle.load(f)
+        self.fire("sceneBeforeOpen")
+        self.nodes.clear()
+        self.uuids.clear()
+        for node in nodes:
+            self.nodes[node.name] = node
+            self.uuids[node.uuid] = node
+        self.selection = selection
+        self.path = path
+        self.fire("sceneOpen")
+
+
+current = Scene()
@@ -0,0 +1,305 @@
+""" The callback, DAG and plug parts of Maya's Python API 2.0 used by the snippets. """
+from maya import _scene
+
+
+class MFn(object):
+    kInvalid = 0
+    kShadingEngine = 1
+    kMesh = 2
+    kNurbsSurface = 3
+    kTransform = 4
+    kNumericAttribute = 5
+    kTypedAttribute = 6
+    kCompoundAttribute = 7
+    kEnumAttribute = 8
+
+
+_TYPE_FN = {"shadingEngine": MFn.kShadingEngine, "mesh": MFn.kMesh, "nurbsSurface": MFn.kNurbsSurface,
+            "transform": MFn.kTransform}
+
+
+class MObject(object):
+    def __init__(self, node=None):
+        self._node = node
+
+    def isNull(self):
+        return self._node is None
+
+    def hasFn(self, fn):
+        return self._node is not None and _TYPE_FN.get(self._node.type) == fn
+
+    def apiType(self):
+        return _TYPE_FN.get(self._node.type, MFn.kInvalid) if self._node is not None else MFn.kInvalid
+
+
+class MFnData(object):
+    kString = 4
+    kIntArray = 10
+
+
+class MFnNumericData(object):
+    kBoolean = 1
+    kInt = 7
+    kFloat = 10
+    kDouble = 11
+
+
+class _MAttribute(object):
+    """ The attribute MObject of a plug, the kind of attribute follows from the (mock) value. """
+    def __init__(self, value):
+        self._value = value
+
+    def hasFn(self, fn):
+        value = self._value
+        if isinstance(value, tuple):
+            return fn == MFn.kCompoundAttribute
+        if isinstance(value, (list, basestring)):
+            return fn == MFn.kTypedAttribute
+        return fn == MFn.kNumericAttribute
+
+
+class MFnNumericAttribute(object):
+    def __init__(self, obj):
+        self._value = obj._value
+
+    def numericType(self):
+        if isinstance(self._value, bool):
+            return MFnNumericData.kBoolean
+        return MFnNumericData.kDouble if isinstance(self._value, float) else MFnNumericData.kInt
+
+
+class _MData(object):
+    """ The data MObject of a plug, only data arrays (lists) are data in the mock. """
+    def __init__(self, value):
+        self._value = value
+
+    def isNull(self):
+        return not isinstance(self._value, list)
+
+
+class MFnIntArrayData(object):
+    def __init__(self, obj):
+        self._array = obj._value
+
+    def __len__(self):
+        return len(self._array)
+
+    def array(self):
+        return list(self._array)
+
+
+class MFnTypedAttribute(object):
+    def __init__(self, obj):
+        self._value = obj._value
+
+    def attrType(self):
+        return MFnData.kIntArray if isinstance(self._value, list) else MFnData.kString
+
+
+class MPlug(object):
+    def __init__(self, node, attr, index=None):
+        self._node = node
+        self._attr = attr
+        # The child index of a compound child plug
+        self._index = index
+
+    def _value(self):
+        value = self._node.attrs[self._attr]
+        return value if self._index is None else value[self._index]
+
+    def node(self):
+        return MObject(self._node)
+
+    def name(self):
+        return "{0}.{1}".format(self._node.name, self._attr)
+
+    def partialName(self, *args, **kwargs):
+        return self._attr
+
+    def attribute(self):
+        return _MAttribute(self._value())
+
+    @property
+    def isCompound(self):
+        return self._index is None and isinstance(self._value(), tuple)
+
+    def numChildren(self):
+        return len(self._value())
+
+    def child(self, index):
+        return MPlug(self._node, self._attr, index)
+
+    def asBool(self):
+        return bool(self._value())
+
+    def asInt(self):
+        return int(self._value())
+
+    def asShort(self):
+        return int(self._value())
+
+    def asDouble(self):
+        return float(self._value())
+
+    def asString(self):
+        return self._value()
+
+    def asMObject(self):
+        return _MData(self._value())
+
+
+class MMessage(object):
+    @staticmethod
+    def removeCallback(callback_id):
+        _scene.current.removeCallback(callback_id)
+
+    @staticmethod
+    def removeCallbacks(callback_ids):
+        for callback_id in callback_ids:
+            _scene.current.removeCallback(callback_id)
+
+
+class MDGMessage(MMessage):
+    @staticmethod
+    def addConnectionCallback(function, client_data=None):
+        def callback(src, src_attr, dst, dst_attr, made):
+            function(MPlug(src, src_attr), MPlug(dst, dst_attr), made, client_data)
+        return _scene.current.addCallback("connection", callback)
+
+    @staticmethod
+    def addNodeAddedCallback(function, node_type="dependNode", client_data=None):
+        return _scene.current.addCallback("nodeAdded", lambda node: function(MObject(node), client_data))
+
+    @staticmethod
+    def addNodeRemovedCallback(function, node_type="dependNode", client_data=None):
+        return _scene.current.addCallback("nodeRemoved", lambda node: function(MObject(node), client_data))
+
+
+class MNodeMessage(MMessage):
+    kAttributeSet = 0x08
+    kAttributeAdded = 0x40
+    kAttributeRemoved = 0x80
+
+    _MESSAGES = {"set": kAttributeSet, "added": kAttributeAdded, "removed": kAttributeRemoved}
+
+    @staticmethod
+    def addAttributeChangedCallback(node, function, client_data=None):
+        def callback(changed, attr, message):
+            function(MNodeMessage._MESSAGES[message], MPlug(changed, attr), MPlug(None, None), client_data)
+        return _scene.current.addCallback(("attributeChanged", node._node.uuid), callback)
+
+    @staticmethod
+    def addNameChangedCallback(node, function, client_data=None):
+        def callback(changed, previous):
+            if node.isNull() or node._node is changed:
+                function(MObject(changed), previous, client_data)
+        return _scene.current.addCallback("nameChanged", callback)
+
+
+class MEventMessage(MMessage):
+    @staticmethod
+    def addEventCallback(event, function, client_data=None):
+        return _scene.current.addCallback(("event", event), lambda *args: function(client_data))
+
+
+class MSceneMessage(MMessage):
+    kBeforeNew = "sceneBeforeNew"
+    kAfterNew = "sceneNew"
+    kBeforeOpen = "sceneBeforeOpen"
+    kAfterOpen = "sceneOpen"
+    kAfterImport = "sceneImport"
+    kAfterLoadReference = "referenceLoad"
+    kAfterUnloadReference = "referenceUnload"
+    kBeforeSave = "sceneBeforeSave"
+
+    @staticmethod
+    def addCallback(message, function, client_data=None):
+        return _scene.current.addCallback(message, lambda *args: function(client_data))
+
+
+class MObjectHandle(object):
+    def __init__(self, obj):
+        self._node = obj._node
+
+    def hashCode(self):
+        return id(self._node)
+
+    def isValid(self):
+        return self._node is not None and _scene.current.nodes.get(self._node.name) is self._node
+
+
+class MDagPath(object):
+    def __init__(self, node=None, path=""):
+        self._node = node
+        self._path = path
+
+    def node(self):
+        return MObject(self._node)
+
+    def fullPathName(self):
+        return self._path
+
+
+class MSelectionList(object):
+    def __init__(self):
+        self._items = []
+
+    def add(self, name):
+        from maya import cmds
+        entries = cmds._resolve([name])
+        if not entries:
+            raise RuntimeError("(kInvalidParameter): Object does not exist")
+        self._items.extend((node, path) for node, path, attr in entries)
+        return self
+
+    def length(self):
+        return len(self._items)
+
+    def getDependNode(self, index):
+        return MObject(self._items[index][0])
+
+    def getDagPath(self, index):
+        node, path = self._items[index]
+        if not node.dag:
+            raise TypeError("item is not a DAG path")
+        return MDagPath(node, path if path.startswith("|") else node.paths()[0])
+
+
+class MUuid(object):
+    def __init__(self, value):
+        self._value = value
+
+    def asString(self):
+        return self._value
+
+
+class MFnDependencyNode(object):
+    def __init__(self, obj):
+        self._node = obj._node
+
+    def name(self):
+        return self._node.name
+
+    def uuid(self):
+        return MUuid(self._node.uuid)
+
+    @property
+    def typeName(self):
+        return self._node.type
+
+    def findPlug(self, attr, want_networked_plug):
+        if attr not in self._node.attrs:
+            raise RuntimeError("(kInvalidParameter): No element at given index")
+        return MPlug(self._node, attr)
+
+
+class MFnDagNode(MFnDependencyNode):
+    def childCount(self):
+        return len(self._node.children)
+
+    def child(self, index):
+        return MObject(self._node.children[index])
+
+    @property
+    def isIntermediateObject(self):
+        return self._node.intermediate
@@ -0,0 +1,601 @@
+import fnmatch
+import functools
+import os
+
+from maya import _scene
+from maya._scene import DAG_TYPES, MATERIAL_TYPES, SHAPE_TYPES, VRAY_ATTRIBUTE_GROUPS
+
+
+_ALIASES = {
+    "sl": "selection", "s": "shapes", "lf": "leaf", "o": "objectsOnly", "l": "long", "mat": "materials",
+    "ni": "noIntermediate", "st": "showType", "typ": "type", "c": "children", "ad": "allDescendents", "f": "fullPath",
+    "p": "parent", "ap": "allParents", "d": "destination", "sh": "shapes", "fnn": "fullNodeName",
+    "q": "query", "e": "edit", "n": "name", "r": "replace", "add": "add", "cl": "clear", "tx": "text",
+}
+
+
+def _flags(kwargs, **overrides):
+    """ Normalize the short flag names of a command call to their long names. """
+    aliases = dict(_ALIASES, **overrides)
+    return dict((aliases.get(key, key), value) for key, value in kwargs.items())
+
+
+# The commands that put an entry on the undo queue (when undo is enabled)
+_UNDOABLE = frozenset(["setAttr", "vray", "addAttr", "deleteAttr", "createNode", "connectAttr", "disconnectAttr",
+                       "delete", "rename"])
+
+
+def _command(function):
+    """ Count every call of a command. Calls made from within `maya.mel.eval` are counted separately. """
+    name = function.__name__
+    undoable = name in _UNDOABLE
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        scene = _scene.current
+        if scene.in_mel:
+            scene.mel_commands[name] += 1
+        else:
+            scene.calls[name] += 1
+        if undoable and scene.undo_enabled:
+            scene.undo_entries += 1
+        return function(*args, **kwargs)
+    return wrapper
+
+
+def _flatten(args):
+    for arg in args:
+        if isinstance(arg, (list, tuple, set)):
+            for item in _flatten(arg):
+                yield item
+        elif arg is not None:
+            yield arg
+
+
+def _splitPlug(name):
+    """ Split "node.attr" into (node name, attribute), the attribute is None for node names. """
+    if "." in name.rsplit("|", 1)[-1]:
+        node, attr = name.rsplit("|", 1)[-1].split(".", 1)
+        return name[:len(name) - len(attr) - 1], attr
+    return name, None
+
+
+def _hasAttr(node, attr):
+    return attr.split("[", 1)[0] in node.attrs
+
+
+def _resolve(names, recursive=False):
+    """ Resolve names, DAG paths, wildcards and plugs to (node, path, attribute) entries.
+
+    Like Maya a wildcard only matches nodes in the namespace of the pattern, with `recursive` the nodes in
+    all (nested) namespaces below it too.
+    """
+    scene = _scene.current
+    entries = []
+    for name in _flatten(names):
+        name, attr = _splitPlug(name)
+        if "*" in name or "?" in name:
+            depth = name.count(":")
+            for node in scene.nodes.values():
+                # Plugs only exist if the attribute does, skip the other nodes early
+                if attr is not None and not _hasAttr(node, attr):
+                    continue
+                node_name = node.name
+                extra = node_name.count(":") - depth
+                if extra < 0 or extra and not recursive:
+                    continue
+                if extra:
+                    node_name = node_name.split(":", extra)[-1]
+                if fnmatch.fnmatchcase(node_name, name):
+                    entries.extend((node, path, attr) for path in node.paths())
+            continue
+
+        node = scene.node(name)
+        if node is None:
+            continue
+        if "|" in name and node.dag:
+            entries.append((node, name if name.startswith("|") else "|" + name, attr))
+        else:
+            entries.extend((node, path, attr) for path in node.paths())
+    return entries
+
+
+def _descendants(node, path):
+    for child in node.children:
+        child_path = "{0}|{1}".format(path, child.name)
+        yield child, child_path
+        for entry in _descendants(child, child_path):
+            yield entry
+
+
+def _matchesType(node, types):
+    for node_type in types:
+        if node.type == node_type:
+            return True
+        if node_type == "shape" and node.type in SHAPE_TYPES:
+            return True
+        if node_type == "dagNode" and node.type in DAG_TYPES:
+            return True
+    return False
+
+
+def _shortName(node, path):
+    """ Maya returns instanced DAG nodes as a partial path, everything else by its (unique) name. """
+    if node.dag and len(node.parents) > 1:
+        return path.lstrip("|")
+    return node.name
+
+
+def _name(node, path, long_names):
+    if long_names and node.dag:
+        return path
+    return _shortName(node, path)
+
+
+def _unique(items):
+    seen = set()
+    result = []
+    for item in items:
+        if item not in seen:
+            seen.add(item)
+            result.append(item)
+    return result
+
+
+def _types(value):
+    if value is None:
+        return None
+    return (value,) if isinstance(value, basestring) else tuple(value)
+
+
+@_command
+def ls(*args, **kwargs):
+    flags = _flags(kwargs)
+    scene = _scene.current
+
+    if args:
+        entries = _resolve(args, flags.get("recursive"))
+        if flags.get("selection"):
+            selected = set(id(node) for node, path, attr in _resolve(scene.selection))
+            entries = [entry for entry in entries if id(entry[0]) in selected]
+    elif flags.get("selection"):
+        entries = _resolve(scene.selection)
+    else:
+        # Like Maya one path per node, all instance paths only with allPaths
+        entries = [(node, path, None) for node in scene.nodes.values()
+                   for path in (node.paths() if flags.get("allPaths") else node.paths()[:1])]
+        if flags.get("dag"):
+            entries = [entry for entry in entries if entry[0].dag]
+
+    if flags.get("dag") and args:
+        expanded = []
+        for node, path, attr in entries:
+            if not node.dag:
+                continue
+            expanded.append((node, path, None))
+            expanded.extend((child, child_path, None) for child, child_path in _descendants(node, path))
+        entries = expanded
+        if flags.get("leaf"):
+            entries = [entry for entry in entries if not entry[0].children]
+
+    types = _types(flags.get("type"))
+    if types:
+        entries = [entry for entry in entries if _matchesType(entry[0], types)]
+    if flags.get("shapes"):
+        entries = [entry for entry in entries if entry[0].type in SHAPE_TYPES]
+    if flags.get("materials"):
+        entries = [entry for entry in entries if entry[0].type in MATERIAL_TYPES]
+    if flags.get("noIntermediate"):
+        entries = [entry for entry in entries if not entry[0].intermediate]
+
+    # Plugs only exist if the attribute does
+    entries = [entry for entry in entries if entry[2] is None or _hasAttr(entry[0], entry[2])]
+
+    if flags.get("uuid"):
+        # One uuid per listed path, so instances give the same uuid more than once
+        return [node.uuid for node, path, attr in _unique(entries)]
+
+    long_names = flags.get("long")
+    names = _unique(_name(node, path, long_names) + ("." + attr if attr else "")
+                    for node, path, attr in entries)
+    if flags.get("showType"):
+        # Alternating name and node type
+        types = dict((_name(node, path, long_names) + ("." + attr if attr else ""), node.type)
+                     for node, path, attr in entries)
+        return [item for name in names for item in (name, types[name])]
+    return names
+
+
+@_command
+def listRelatives(*args, **kwargs):
+    flags = _flags(kwargs)
+    types = _types(flags.get("type"))
+    result = []
+    for node, path, attr in _resolve(args):
+        if flags.get("parent") or flags.get("allParents"):
+            parents = node.parents if flags.get("allParents") else node.parents[:1]
+            for parent in parents:
+                parent_path = parent.paths()[0]
+                result.append(parent_path if flags.get("fullPath") else _shortName(parent, parent_path))
+            continue
+
+        if flags.get("allDescendents"):
+            relatives = list(_descendants(node, path))
+        else:
+            relatives = [(child, "{0}|{1}".format(path, child.name)) for child in node.children]
+        for child, child_path in relatives:
+            if flags.get("shapes") and child.type not in SHAPE_TYPES:
+                continue
+            if types and not _matchesType(child, types):
+                continue
+            if flags.get("noIntermediate") and child.intermediate:
+                continue
+            result.append(child_path if flags.get("fullPath") else _shortName(child, child_path))
+    return _unique(result) or None
+
+
+def _plugMatches(attr, query):
+    return query is None or attr == query or attr.startswith(query + "[") or attr.startswith(query + ".")
+
+
+@_command
+def listConnections(*args, **kwargs):
+    flags = _flags(kwargs, s="source")
+    source = flags.get("source", True)
+    destination = flags.get("destination", True)
+    types = _types(flags.get("type"))
+    result = []
+    for name in _flatten(args):
+        node_name, query = _splitPlug(name)
+        node = _scene.current.node(node_name)
+        if node is None:
+            raise ValueError("No object matches name: {0}".format(name))
+        for attr, other, other_attr, is_source in node.connections:
+            if not _plugMatches(attr, query):
+                continue
+            if (is_source and not destination) or (not is_source and not source):
+                continue
+            if flags.get("shapes") and other.type == "transform":
+                shapes = [child for child in other.children if child.type in SHAPE_TYPES]
+                other = shapes[0] if shapes else other
+            if types and not _matchesType(other, types):
+                continue
+
+            other_path = other.paths()[0]
+            other_name = other_path if flags.get("fullNodeName") and other.dag else _shortName(other, other_path)
+            if flags.get("plugs"):
+                other_name = "{0}.{1}".format(other_name, other_attr)
+            if flags.get("connections"):
+                result.append("{0}.{1}".format(node_name, attr))
+            result.append(other_name)
+    return result or None
+
+
+@_command
+def listHistory(*args, **kwargs):
+    flags = _flags(kwargs, f="future")
+    future = flags.get("future")
+    result = []
+    pending = [node for node, path, attr in _resolve(args)]
+    seen = set()
+    while pending:
+        node = pending.pop()
+        if id(node) in seen:
+            continue
+        seen.add(id(node))
+        result.append(node.name)
+        for attr, other, other_attr, is_source in node.connections:
+            if is_source == bool(future):
+                pending.append(other)
+    return result or None
+
+
+@_command
+def objExists(name):
+    name, attr = _splitPlug(name)
+    node = _scene.current.node(name)
+    return node is not None and (attr is None or _hasAttr(node, attr))
+
+
+def _plug(plug):
+    name, attr = _splitPlug(plug)
+    node = _scene.current.node(name)
+    if node is None or attr is None or not _hasAttr(node, attr):
+        raise ValueError("No object matches name: {0}".format(plug))
+    return node, attr
+
+
+@_command
+def getAttr(plug, **kwargs):
+    node, attr = _plug(plug)
+    if kwargs.get("lock") or kwargs.get("l"):
+        return attr in node.locked
+    value = node.attrs[attr]
+    if kwargs.get("type") or kwargs.get("typ"):
+        return _attributeType(value)
+    if kwargs.get("size") or kwargs.get("s"):
+        # The amount of elements of a multi attribute, the mock has none (data arrays are no multi attributes)
+        return 1
+    if isinstance(value, list):
+        # Data arrays (like Int32Array) are stored as list, compounds as tuple
+        return list(value)
+    return [value] if isinstance(value, tuple) else value
+
+
+def _attributeType(value):
+    if isinstance(value, list):
+        return "Int32Array"
+    if isinstance(value, tuple):
+        return "double{0}".format(len(value))
+    if isinstance(value, basestring):
+        return "string"
+    if isinstance(value, float):
+        return "double"
+    return "long"
+
+
+@_command
+def setAttr(plug, *values, **kwargs):
+    node, attr = _plug(plug)
+    lock = kwargs.get("lock", kwargs.get("l"))
+    if lock is not None:
+        (node.locked.add if lock else node.locked.discard)(attr)
+        if not values:
+            return
+    if attr in node.locked:
+        raise RuntimeError("The attribute '{0}' is locked or connected and cannot be modified.".format(plug))
+    if len(values) == 1:
+        value = values[0]
+        if isinstance(value, (list, tuple)):
+            array = kwargs.get("type", kwargs.get("typ", "")).endswith("Array")
+            value = list(value) if array else tuple(value)
+        node.attrs[attr] = value
+    else:
+        node.attrs[attr] = tuple(values)
+    _scene.current.attributeChanged(node, attr, "set")
+
+
+@_command
+def addAttr(*args, **kwargs):
+    flags = _flags(kwargs, ln="longName", dv="defaultValue")
+    for node, path, attr in _resolve(args):
+        node.attrs.setdefault(flags["longName"], flags.get("defaultValue", 0))
+        _scene.current.attributeChanged(node, flags["longName"], "added")
+
+
+@_command
+def deleteAttr(*args, **kwargs):
+    for node, path, attr in _resolve(args):
+        attr = kwargs.get("attribute", kwargs.get("at", attr))
+        if node.attrs.pop(attr, None) is not None:
+            _scene.current.attributeChanged(node, attr, "removed")
+
+
+@_command
+def attributeQuery(attr, **kwargs):
+    node = _scene.current.node(kwargs.get("node", kwargs.get("n")))
+    if kwargs.get("exists", kwargs.get("ex")):
+        return node is not None and _hasAttr(node, attr)
+    raise NotImplementedError("attributeQuery only supports the exists flag")
+
+
+@_command
+def vray(action=None, *args):
+    scene = _scene.current
+    if action is None:
+        return None
+    if action == "addAttributesFromGroup":
+        name, group, state = args
+        node = scene.node(name)
+        if node is None:
+            raise RuntimeError("vray: node not found: {0}".format(name))
+        node_types, attributes = VRAY_ATTRIBUTE_GROUPS.get(group, ((), ()))
+        if node.type not in node_types:
+            return None
+        for attr, default in attributes:
+            if int(state):
+                if attr not in node.attrs:
+                    node.attrs[attr] = default
+                    scene.attributeChanged(node, attr, "added")
+            elif attr in node.attrs:
+                del node.attrs[attr]
+                scene.attributeChanged(node, attr, "removed")
+        return None
+    if action == "version":
+        return "3.60.04"
+    return None
+
+
+@_command
+def createNode(node_type, **kwargs):
+    flags = _flags(kwargs)
+    scene = _scene.current
+    parent = scene.node(flags["parent"]) if flags.get("parent") else None
+    if parent is None and node_type in SHAPE_TYPES:
+        # Like Maya, a shape gets a transform
+        parent = scene.createNode("transform", "transform1")
+    return scene.createNode(node_type, flags.get("name"), parent).name
+
+
+@_command
+def connectAttr(src, dst, **kwargs):
+    src_node, src_attr = _splitPlug(src)
+    dst_node, dst_attr = _splitPlug(dst)
+    scene = _scene.current
+    scene.connect(scene.node(src_node), src_attr, scene.node(dst_node), dst_attr)
+
+
+@_command
+def disconnectAttr(src, dst, **kwargs):
+    src_node, src_attr = _splitPlug(src)
+    dst_node, dst_attr = _splitPlug(dst)
+    scene = _scene.current
+    scene.disconnect(scene.node(src_node), src_attr, scene.node(dst_node), dst_attr)
+
+
+@_command
+def delete(*args, **kwargs):
+    scene = _scene.current
+    for node in set(node for node, path, attr in _resolve(args)):
+        if node.name in scene.nodes:
+            scene.delete(node)
+
+
+@_command
+def rename(name, new_name, **kwargs):
+    scene = _scene.current
+    return scene.rename(scene.node(name), new_name)
+
+
+@_command
+def select(*args, **kwargs):
+    flags = _flags(kwargs)
+    scene = _scene.current
+    names = list(_flatten(args))
+    if flags.get("clear"):
+        scene.selection = []
+    elif flags.get("add"):
+        scene.selection.extend(names)
+    else:
+        scene.selection = names
+
+
+@_command
+def file(*args, **kwargs):
+    flags = _flags(kwargs)
+    scene = _scene.current
+    if flags.get("query") and flags.get("sceneName"):
+        return scene.path
+    if flags.get("rename"):
+        scene.path = flags["rename"]
+        return scene.path
+    if flags.get("new"):
+        scene.clear()
+        return ""
+    if flags.get("open"):
+        if not args or not os.path.isfile(args[0]):
+            raise RuntimeError("File not found: {0}".format(args[0] if args else ""))
+        scene.open(args[0])
+        return scene.path
+    if flags.get("save"):
+        if not scene.path:
+            raise RuntimeError("The scene has no name, rename it before saving")
+        scene.fire("sceneBeforeSave")
+        scene.save(scene.path)
+        return scene.path
+    raise NotImplementedError("The mock file command only supports querying the scene name, rename, new, open "
+                              "and save (of scenes saved by the mock)")
+
+
+@_command
+def promptDialog(*args, **kwargs):
+    flags = _flags(kwargs)
+    if flags.get("query"):
+        return _scene.current.prompt_text
+    return "OK"
+
+
+@_command
+def confirmDialog(*args, **kwargs):
+    return "Yes"
+
+
+@_command
+def getModifiers(*args, **kwargs):
+    return 0
+
+
+@_command
+def progressWindow(*args, **kwargs):
+    flags = _flags(kwargs, ic="isCancelled", pr="progress", st="status", ep="endProgress", ii="isInterruptable",
+                   max="maxValue", t="title", q="query", e="edit")
+    scene = _scene.current
+    if flags.get("query"):
+        if flags.get("isCancelled"):
+            return scene.progress_cancelled
+        if flags.get("progress"):
+            return scene.progress.get("progress", 0)
+        return None
+    if flags.get("endProgress"):
+        scene.progress = {}
+        scene.progress_cancelled = False
+        return None
+    scene.progress.update((key, value) for key, value in flags.items() if key != "edit")
+    return True
+
+
+@_command
+def undoInfo(*args, **kwargs):
+    flags = _flags(kwargs, q="query", st="state", swf="stateWithoutFlush", ock="openChunk", cck="closeChunk",
+                   cn="chunkName")
+    scene = _scene.current
+    if flags.get("query"):
+        if flags.get("state") or flags.get("stateWithoutFlush"):
+            return scene.undo_enabled
+        return None
+    if flags.get("openChunk"):
+        scene.undo_chunks += 1
+    elif flags.get("closeChunk"):
+        scene.undo_chunks -= 1
+    elif "stateWithoutFlush" in flags:
+        scene.undo_enabled = bool(flags["stateWithoutFlush"])
+    elif "state" in flags:
+        scene.undo_enabled = bool(flags["state"])
+        if not scene.undo_enabled:
+            scene.undo_entries = 0
+
+
+@_command
+def memory(*args, **kwargs):
+    """ A simulated heap: a base size plus the undo queue, 2KB per entry (on par with small setAttr entries). """
+    scene = _scene.current
+    megabytes = 256.0 + scene.undo_entries * 2.0 / 1024
+    if kwargs.get("megaByte", kwargs.get("mb")):
+        return megabytes
+    return megabytes * 1024 * 1024
+
+
+@_command
+def listAttr(*args, **kwargs):
+    result = []
+    for node, path, attr in _resolve(args):
+        result.extend(sorted(node.attrs))
+    return result or None
+
+
+@_command
+def pluginInfo(plugin, **kwargs):
+    flags = _flags(kwargs, q="query", v="version", l="loaded")
+    if flags.get("version"):
+        return "3.60.04"
+    if flags.get("loaded"):
+        return plugin == "vrayformaya"
+    raise NotImplementedError("The mock pluginInfo command only supports querying the version and loaded")
+
+
+@_command
+def nodeType(name, **kwargs):
+    flags = _flags(kwargs, itn="isTypeName", i="inherited")
+    if flags.get("isTypeName"):
+        # Only the levels of the type hierarchy the mock knows about
+        bases = ["dagNode", "shape"] if name in SHAPE_TYPES else ["dagNode"] if name in DAG_TYPES else []
+        return bases + [name] if flags.get("inherited") else name
+    node = _scene.current.node(name)
+    if node is None:
+        raise RuntimeError("No object matches name: {0}".format(name))
+    return node.type
+
+
+@_command
+def loadPlugin(plugin, **kwargs):
+    if plugin != "vrayformaya":
+        raise RuntimeError("Plug-in, \"{0}\", was not found on MAYA_PLUG_IN_PATH.".format(plugin))
+    return [plugin]
+
+
+@_command
+def internalVar(**kwargs):
+    flags = _flags(kwargs, uad="userAppDir")
+    if flags.get("userAppDir"):
+        return _scene.current.user_app_dir
+    raise NotImplementedError("The mock internalVar command only supports userAppDir")
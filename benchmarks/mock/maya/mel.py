@@ -0,0 +1,69 @@
+import re
+
+from maya import _scene, cmds
+
+
+_STATEMENT = re.compile(r'(?:[^";]|"(?:[^"\\]|\\.)*")+;?')
+_TOKEN = re.compile(r'"((?:[^"\\]|\\.)*)"|([^\s;]+)')
+
+
+def _value(token):
+    for convert in (int, float):
+        try:
+            return convert(token)
+        except ValueError:
+            pass
+    return token
+
+
+def _unescape(text):
+    return text.replace('\\"', '"').replace("\\\\", "\\")
+
+
+def _run(tokens):
+    command, args = tokens[0], tokens[1:]
+    if command == "vray":
+        return cmds.vray(*[_value(arg) if index == 3 else arg for index, arg in enumerate(args, 1)])
+
+    if command == "setAttr":
+        plug = None
+        values = []
+        kwargs = {}
+        arg_iter = iter(args)
+        for arg in arg_iter:
+            if arg == "-type":
+                kwargs["type"] = next(arg_iter)
+            elif plug is None:
+                plug = arg
+            elif kwargs.get("type") == "string":
+                values.append(_unescape(arg))
+            else:
+                values.append(_value(arg))
+        return cmds.setAttr(plug, *values, **kwargs)
+
+    if command == "vrayAddRenderElement":
+        element = _scene.current.createNode("VRayRenderElement", args[0][:1].lower() + args[0][1:])
+        if args[0] == "MultiMatteElement":
+            element.attrs.update({"vray_name_multimatte": "", "vray_redid_multimatte": 0,
+                                  "vray_greenid_multimatte": 0, "vray_blueid_multimatte": 0,
+                                  "vray_usematid_multimatte": 0})
+        return element.name
+
+    raise NotImplementedError("The mock MEL interpreter doesn't support: {0}".format(command))
+
+
+def eval(script):
+    """ Run the simple MEL statements the snippets generate (vray and setAttr) through the mock commands. """
+    scene = _scene.current
+    scene.calls["eval"] += 1
+    scene.in_mel += 1
+    try:
+        result = None
+        for match in _STATEMENT.finditer(script):
+            tokens = [token.group(1) if token.group(1) is not None else token.group(2)
+                      for token in _TOKEN.finditer(match.group(0))]
+            if tokens:
+                result = _run(tokens)
+        return result
+    finally:
+        scene.in_mel -= 1
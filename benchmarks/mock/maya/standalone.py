@@ -0,0 +1,21 @@
+""" Stand-in for `maya.standalone`, the start up of a headless Maya session.
+
+Starting mayapy takes seconds (loading the libraries and plug-ins), set the `MOCK_MAYA_STARTUP` environment
+variable to the seconds `initialize` should take to simulate it. Set `MOCK_MAYA_STARTUP_ERROR` to a message to make
+`initialize` fail with it, like a mayapy without a license.
+"""
+import os
+import time
+
+from maya import _scene
+
+
+def initialize(name="python"):
+    time.sleep(float(os.environ.get("MOCK_MAYA_STARTUP", 0)))
+    if os.environ.get("MOCK_MAYA_STARTUP_ERROR"):
+        raise RuntimeError(os.environ["MOCK_MAYA_STARTUP_ERROR"])
+    _scene.current.clear()
+
+
+def uninitialize():
+    _scene.current.clear()
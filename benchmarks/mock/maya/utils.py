@@ -0,0 +1,17 @@
+import collections
+
+
+# The functions waiting for Maya to be idle, there is no event loop in the mock so run them with processIdleEvents
+_deferred = collections.deque()
+
+
+def executeDeferred(function, *args, **kwargs):
+    """ Queue the function until `processIdleEvents` is called. """
+    _deferred.append((function, args, kwargs))
+
+
+def processIdleEvents():
+    """ Run the deferred functions, including those queued while running them. """
+    while _deferred:
+        function, args, kwargs = _deferred.popleft()
+        function(*args, **kwargs)
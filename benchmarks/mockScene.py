@@ -0,0 +1,93 @@
+""" Generate synthetic scenes in the mock `maya.cmds` and synthetic .ma files for the benchmarks. """
+import gzip
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "mock"))
+
+from maya import _scene
+
+
+def buildScene(nodes=1000, group_size=100, shapes_per_material=100, instances=0, vfbsa_size=1000):
+    """ Build a new mock scene of (about) `nodes` DAG nodes.
+
+    The scene has groups of transforms with a mesh shape each, a VRayMtl and shading engine per
+    `shapes_per_material` shapes, a vraySettings node and everything selected (the groups).
+
+    :param nodes: The amount of transforms and shapes to create, they come in pairs.
+    :type  nodes: int
+
+    :param instances: The amount of extra instance paths, each instances one of the shapes again.
+    :type  instances: int
+
+    :param vfbsa_size: The length of the .vfbSA array on the vraySettings node.
+    :type  vfbsa_size: int
+
+    :rtype: maya._scene.Scene
+    """
+    scene = _scene.current
+    scene.clear()
+
+    settings = scene.createNode("VRaySettingsNode", "vraySettings")
+    settings.attrs["vfbSA"] = range(vfbsa_size)
+
+    count = max(1, nodes // 2)
+    shading_engines = []
+    for index in range(max(1, count // shapes_per_material)):
+        material = scene.createNode("VRayMtl", "vrayMtl{0}".format(index))
+        shading_engine = scene.createNode("shadingEngine", "vrayMtl{0}SG".format(index))
+        scene.connect(material, "outColor", shading_engine, "surfaceShader")
+        shading_engines.append(shading_engine)
+
+    groups = []
+    shapes = []
+    group = None
+    for index in range(count):
+        if index % group_size == 0:
+            group = scene.createNode("transform", "group{0}".format(len(groups)))
+            groups.append(group)
+        transform = scene.createNode("transform", "pCube{0}".format(index), group)
+        shape = scene.createNode("mesh", "pCubeShape{0}".format(index), transform)
+        shading_engine = shading_engines[index % len(shading_engines)]
+        scene.connect(shape, "instObjGroups[0]", shading_engine, "dagSetMembers[{0}]".format(index))
+        shapes.append(shape)
+
+    for index in range(instances):
+        transform = scene.createNode("transform", "instance{0}".format(index), groups[index % len(groups)])
+        scene.parent(shapes[index % len(shapes)], transform)
+
+    scene.selection = [group.name for group in groups]
+    return scene
+
+
+def writeMaFile(path, nodes=1000, vfbsa_size=100000, compress=False):
+    """ Write a synthetic maya ASCII file with `nodes` transform/mesh nodes and a .vfbSA array.
+
+    :return: The size of the (uncompressed) file in bytes.
+    :rtype: int
+    """
+    opener = gzip.open if compress else open
+    size = 0
+    with opener(path, "wb") as fout:
+        def write(text):
+            fout.write(text)
+            return len(text)
+
+        size += write('//Maya ASCII 2014 scene\n//Name: {0}\nrequires maya "2014";\n'
+                      'requires -nodeType "VRaySettingsNode" "vrayformaya" "3.00.01";\n'
+                      'fileInfo "application" "maya";\n'.format(os.path.basename(path)))
+        for index in range(max(1, nodes // 2)):
+            size += write('createNode transform -n "pCube{0}";\n'
+                          '\tsetAttr ".t" -type "double3" {0} 0 0 ;\n'
+                          'createNode mesh -n "pCubeShape{0}" -p "pCube{0}";\n'
+                          '\tsetAttr -k off ".v";\n'
+                          '\tsetAttr -s 8 ".vt[0:7]"  -0.5 -0.5 0.5 0.5 -0.5 0.5 -0.5 0.5 0.5 0.5 0.5 0.5\n'
+                          '\t\t -0.5 0.5 -0.5 0.5 0.5 -0.5 -0.5 -0.5 -0.5 0.5 -0.5 -0.5;\n'.format(index))
+            if index == nodes // 4:
+                size += write('createNode VRaySettingsNode -s -n "vraySettings";\n'
+                              '\tsetAttr ".vfbSA" -type "Int32Array" {0}'.format(vfbsa_size))
+                for start in range(0, vfbsa_size, 16):
+                    size += write("\n\t\t" + " ".join(str(value % 7) for value in range(start, min(start + 16, vfbsa_size))))
+                size += write(" ;\n")
+        size += write("// End of file\n")
+    return size
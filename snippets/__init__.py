@@ -0,0 +1,99 @@
+""" The V-ray for Maya snippets as a package with lazily loaded modules.
+
+Importing the package imports nothing else (not even Maya), a snippet module is only loaded the first time it's
+used. That keeps Maya's start up and a shelf click fast however many snippets and helpers there are. One shelf
+button (or a menu) can run any of the registered tools:
+
+    import snippets
+    snippets.run("addVrayObjectIds")
+
+The modules can also be reached as attributes, they're imported on first access: `snippets.vrayCatalog.loadCatalog()`.
+
+Note: use either the package (its parent directory on the Python path) or the snippets directory itself on the
+Python path, not both, otherwise modules with state (like the indexes) are loaded twice.
+"""
+import os
+import sys
+import types
+
+
+# The tools for the shelf: (name, module, function, annotation)
+TOOLS = (
+    ("addVrayObjectIds", "addVrayObjectIds", "addVrayObjectIds",
+     "Add V-ray object IDs to the selected shapes"),
+    ("addVrayMaterialIds", "addVrayMaterialIds", "addVrayMaterialIds",
+     "Add V-ray material IDs to the selected materials"),
+    ("addVraySubdivisionAttribute", "addVraySubdivisionAttributes", "addVraySubdivisionAttribute",
+     "Add the V-ray subdivision attributes to the selected shapes"),
+    ("applyAttributeRules", "vrayAttributeRules", "applyAttributeRules",
+     "Apply the V-ray attribute naming convention rules to the scene"),
+    ("vrayFrameBufferFix", "vrayFrameBufferFix", "vrayFrameBufferFix",
+     "Fix the missing V-ray frame buffer"),
+    ("compactSettings", "vraySettingsAudit", "compactSettings",
+     "Compact the bloated V-ray settings arrays (like the frame buffer settings .vfbSA)"),
+    ("suppressRenderView", "suppressRenderView", "suppressRenderView",
+     "Toggle suppressing Maya's render view while using the V-ray frame buffer"),
+    ("forceHideRenderView", "forceHideRenderView", "forceHideRenderView",
+     "Toggle hiding the render view in a dock control"),
+    ("autoRenderViewMinimize", "autoRenderViewMinimize", "autoRenderViewMinimize",
+     "Minimize the render view when it pops up (hold a modifier to disable)"),
+)
+
+
+def _isModule(paths, name):
+    return any(os.path.exists(os.path.join(path, name + extension)) for path in paths
+               for extension in (".py", ".pyc"))
+
+
+class _LazyPackage(types.ModuleType):
+    """ The package module, it imports a submodule when it's first accessed as attribute. """
+
+    def __getattr__(self, name):
+        if name.startswith("__") or not _isModule(self.__path__, name):
+            raise AttributeError("'{0}' has no module or attribute '{1}'".format(self.__name__, name))
+        __import__("{0}.{1}".format(self.__name__, name))
+        # The import sets the submodule as attribute of the package
+        return self.__dict__[name]
+
+
+def tool(name):
+    """ Return the function of a registered tool, its module is imported when needed.
+
+    :rtype: callable
+    """
+    for tool_name, module, function, annotation in TOOLS:
+        if tool_name == name:
+            return getattr(getattr(sys.modules[__name__], module), function)
+    raise ValueError("Unknown tool: {0}, use one of {1}".format(name, ", ".join(entry[0] for entry in TOOLS)))
+
+
+def run(name, *args, **kwargs):
+    """ Run a registered tool, eg. as the command of a shelf button: `import snippets; snippets.run("...")`. """
+    return tool(name)(*args, **kwargs)
+
+
+def installShelf(shelf="VRaySnippets"):
+    """ Create a shelf with a button per registered tool, replacing the shelf if it exists.
+
+    :rtype: str
+    :return: The shelf.
+    """
+    import maya.cmds as mc
+    import maya.mel as mel
+
+    if mc.shelfLayout(shelf, q=1, exists=True):
+        mc.deleteUI(shelf)
+    shelf = mc.shelfLayout(shelf, parent=mel.eval("$tmp = $gShelfTopLevel"))
+    for name, module, function, annotation in TOOLS:
+        mc.shelfButton(parent=shelf, label=name, imageOverlayLabel=name[:6], image="pythonFamily.png",
+                       annotation=annotation, sourceType="python",
+                       command="import {0}; {0}.run({1!r})".format(__name__, name))
+    return shelf
+
+
+# Swap in the lazy package module, keeping everything defined above. The original module is kept alive, the
+# functions above still use its globals
+_package = _LazyPackage(__name__, __doc__)
+_package.__dict__.update((key, value) for key, value in globals().items() if key not in ("__name__", "__doc__"))
+_package._module = sys.modules[__name__]
+sys.modules[__name__] = _package
@@ -1,29 +1,35 @@
 import maya.cmds as mc
 
+from undoPolicies import UNDO_CHUNK, bulkAddVrayAttributeGroup
 
-def addVrayMaterialIds(materials=None):
+
+def addVrayMaterialIds(materials=None, undo=UNDO_CHUNK):
     """ Add a vray_material_id attribute to selected materials (and related materials from objects)
 
     :param materials: Materials to apply the attribute to. If materials is None it will get
                       the materials related to the current selection.
+
+    :param undo: The undo policy (see `undoPolicies`), by default the whole operation is one undo step.
+    :type  undo: str
+
+    :rtype: dict or None
+    :return: The counts returned by `undoPolicies.bulkAddVrayAttributeGroup`, None if cancelled.
+             With the Auto button the IDs are allocated by `vrayIdAllocator`, see its return value.
     """
     if materials is None:
         # Get selected materials
         materials = mc.ls(sl=1, mat=1)
 
-        # Get materials related to selection (material from object)
+        # Get materials assigned to the selection (material from object)
         # And add those materials to the material list we already have
         sel = mc.ls(sl=1)
         if sel:
-            sel_history = mc.listHistory(sel,f=1)
-            if sel_history:
-                sel_connections = mc.listConnections(sel_history)
-                if sel_connections:
-                    connected_materials = mc.ls(sel_connections, mat=True)
-                    if connected_materials:
-                        materials = set(materials)
-                        materials.update(connected_materials)
-                        materials = list(materials)
+            from shadingEngineIndex import materialsFromNodes
+            connected_materials = materialsFromNodes(sel)
+            if connected_materials:
+                materials = set(materials)
+                materials.update(connected_materials)
+                materials = list(materials)
     else:
         # filter input to materials only
         materials = mc.ls(materials, mat=1)
@@ -34,16 +40,20 @@ def addVrayMaterialIds(materials=None):
     if materials:
         result = mc.promptDialog(title='Material ID value',
                                     message='Material ID:',
-                                    button=['OK', 'Cancel'],
+                                    button=['OK', 'Auto', 'Cancel'],
                                     defaultButton='OK',
                                     cancelButton='Cancel',
                                     dismissString='Cancel')
 
+        if result == 'Auto':
+            # Dense IDs per group, packed into as few MultiMatte render elements as possible
+            from vrayIdAllocator import assignMaterialIds
+            return assignMaterialIds(materials, undo=undo)
+
         if result == 'OK':
             value = int(mc.promptDialog(query=True, text=True))
-            for mat in materials:
-                mc.vray("addAttributesFromGroup", mat, "vray_material_id", 1)
-                mc.setAttr("{0}.{1}".format(mat, 'vrayMaterialId'), value)
+            return bulkAddVrayAttributeGroup(materials, "vray_material_id", {"vrayMaterialId": value}, undo=undo,
+                                             verbose=False)
 
 
 if __name__ == "__main__":
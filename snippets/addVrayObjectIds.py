@@ -1,33 +1,58 @@
 import maya.cmds as mc
 
+from shapeResolver import GEOMETRY_TYPES, resolveShapes
+from undoPolicies import UNDO_CHUNK, bulkAddVrayAttributeGroup
+from vrayCatalog import supportedTypes
 
-def addVrayObjectIds(shapes=None):
+
+def addVrayObjectIds(shapes=None, deferred=False, undo=UNDO_CHUNK):
     """ Add a vray_objectID attribute to selected meshes
 
     :param shapes: Shapes to apply the attribute to. If shapes is None it will get
-                   the shapes related to the current selection.
+                   the unique shapes in the hierarchies of the current selection.
+
+    :param deferred: If True the attributes are added in chunks while Maya is idle (with progress and
+                     cancel) instead of blocking the UI until all shapes are done.
+    :type  deferred: bool
+
+    :param undo: The undo policy (see `undoPolicies`), by default the whole operation is one undo step.
+                 Not used when deferred, a cancelled job is rolled back instead.
+    :type  undo: str
+
+    :rtype: dict or deferredJob.DeferredJob or None
+    :return: The counts returned by `undoPolicies.bulkAddVrayAttributeGroup` (or the started job if
+             deferred), None if cancelled.
+             With the Auto button the IDs are allocated by `vrayIdAllocator`, see its return value.
     """
+    # The shape types the group can be added to, from the catalog so it costs no extra command calls
+    types = supportedTypes("vray_objectID", GEOMETRY_TYPES)
     if shapes is None:
-        shapes = mc.ls(sl=1, s=1, dag=1, lf=1, o=1, long=True)
-
-    if shapes:
+        # The unique mesh and nurbsSurface shapes below the selection, instanced shapes only once
+        shapes = resolveShapes(types=types)
+    elif shapes:
         # Can only add objectIds to mesh, nurbsSurface so lets filter it
-        shapes = mc.ls(shapes, type=("mesh", "nurbsSurface"))
+        shapes = mc.ls(shapes, type=types)
 
     if shapes:
         result = mc.promptDialog(title='Object ID value',
                                     message='Object ID:',
-                                    button=['OK', 'Cancel'],
+                                    button=['OK', 'Auto', 'Cancel'],
                                     defaultButton='OK',
                                     cancelButton='Cancel',
                                     dismissString='Cancel')
 
+        if result == 'Auto':
+            # Dense IDs per group, packed into as few MultiMatte render elements as possible
+            from vrayIdAllocator import assignObjectIds
+            return assignObjectIds(shapes, undo=undo)
+
         if result == 'OK':
             value = int(mc.promptDialog(query=True, text=True))
-
-            for shape in shapes:
-                mc.vray("addAttributesFromGroup", shape, "vray_objectID", 1)
-                mc.setAttr("{0}.{1}".format(shape, 'vrayObjectID'), value)
+            if deferred:
+                from vrayAttributeGroups import addVrayAttributeGroupDeferred
+                return addVrayAttributeGroupDeferred(shapes, "vray_objectID", {"vrayObjectID": value})
+            return bulkAddVrayAttributeGroup(shapes, "vray_objectID", {"vrayObjectID": value}, undo=undo,
+                                             verbose=False)
 
 
 if __name__ == "__main__":
@@ -1,23 +1,42 @@
 import maya.cmds as mc
 
+from shapeResolver import GEOMETRY_TYPES, resolveShapes
+from undoPolicies import UNDO_CHUNK, bulkAddVrayAttributeGroup
+from vrayCatalog import supportedTypes
 
-def addVraySubdivisionAttribute(shapes=None):
+
+def addVraySubdivisionAttribute(shapes=None, deferred=False, undo=UNDO_CHUNK):
     """ Add a v-ray subdivision attribute to selected meshes
 
     :param shapes: Shapes to apply the attribute to. If shapes is None it will get
-                   the shapes related to the current selection.
+                   the unique shapes in the hierarchies of the current selection.
+
+    :param deferred: If True the attributes are added in chunks while Maya is idle (with progress and
+                     cancel) instead of blocking the UI until all shapes are done.
+    :type  deferred: bool
+
+    :param undo: The undo policy (see `undoPolicies`), by default the whole operation is one undo step.
+                 Not used when deferred, a cancelled job is rolled back instead.
+    :type  undo: str
+
+    :rtype: dict or deferredJob.DeferredJob
+    :return: The counts returned by `undoPolicies.bulkAddVrayAttributeGroup` (or the started job if deferred).
     """
 
+    # The shape types the group can be added to, from the catalog so it costs no extra command calls
+    types = supportedTypes("vray_subdivision", GEOMETRY_TYPES)
     if shapes is None:
-        shapes = mc.ls(sl=1, s=1, dag=1, lf=1, o=1, long=True)
-
-    if shapes:
+        # The unique mesh and nurbsSurface shapes below the selection, instanced shapes only once
+        shapes = resolveShapes(types=types)
+    elif shapes:
         # Only apply to mesh or nurbsSurface (other shapes can't contain the vray_subdivision attribute)
-        shapes = mc.ls(shapes, type=("mesh", "nurbsSurface"))
+        shapes = mc.ls(shapes, type=types)
 
     if shapes:
-        for shape in shapes:
-            mc.vray("addAttributesFromGroup", shape, "vray_subdivision", 1)
+        if deferred:
+            from vrayAttributeGroups import addVrayAttributeGroupDeferred
+            return addVrayAttributeGroupDeferred(shapes, "vray_subdivision")
+        return bulkAddVrayAttributeGroup(shapes, "vray_subdivision", undo=undo, verbose=False)
     else:
         raise RuntimeError("No shapes found to apply the vray_subdivision attribute group to.")
 
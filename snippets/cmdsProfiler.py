@@ -0,0 +1,146 @@
+import maya.cmds as mc
+import maya.mel as mel
+import contextlib
+import json
+import os
+import sys
+import time
+
+
+# The commands the snippets spend their time in, `mel.eval` runs the batched attribute group commands
+COMMANDS = ("vray", "ls", "listHistory", "listConnections", "setAttr", "file", "mel.eval")
+
+
+class CommandProfile(object):
+    """ The calls recorded while profiling: count, cumulative time and slowest call per command and call site.
+
+    A call site is the file, line and function in the snippets that called the command.
+    """
+    def __init__(self, name, trace=False):
+        self.name = name
+        self.start = time.time()
+        self.end = None
+        self.commands = {}
+        self.sites = {}
+        self.events = [] if trace else None
+
+    def record(self, command, site, start, duration):
+        for key, stats in ((command, self.commands), ((command, site), self.sites)):
+            entry = stats.get(key)
+            if entry is None:
+                stats[key] = [1, duration, duration]
+            else:
+                entry[0] += 1
+                entry[1] += duration
+                if duration > entry[2]:
+                    entry[2] = duration
+        if self.events is not None:
+            self.events.append((command, site, start, duration))
+
+    @property
+    def duration(self):
+        return (self.end or time.time()) - self.start
+
+    def summary(self, sites=5):
+        """ Return a compact text summary of the commands and the slowest call sites.
+
+        :param sites: The amount of slowest call sites (by cumulative time) to list.
+        :type  sites: int
+
+        :rtype: str
+        """
+        lines = ["{0}: {1:.3f} seconds".format(self.name, self.duration),
+                 "  {0:<20} {1:>8} {2:>10} {3:>10}".format("command", "calls", "total", "slowest")]
+        for command, (count, total, slowest) in sorted(self.commands.items(), key=lambda item: -item[1][1]):
+            lines.append("  {0:<20} {1:>8} {2:>10.4f} {3:>10.4f}".format(command, count, total, slowest))
+
+        slowest_sites = sorted(self.sites.items(), key=lambda item: -item[1][1])[:sites]
+        if slowest_sites:
+            lines.append("  slowest call sites:")
+            for (command, (filename, line, function)), (count, total, slowest) in slowest_sites:
+                lines.append("  {0:>10.4f} {1:>8}x {2} in {3} ({4}:{5})".format(
+                    total, count, command, function, os.path.basename(filename), line))
+        return "\n".join(lines)
+
+    def chromeTrace(self):
+        """ Return the recorded calls in the Chrome trace event format (load it in chrome://tracing).
+
+        :rtype: dict
+        """
+        def event(name, start, duration, args=None):
+            return {"name": name, "cat": "maya.cmds", "ph": "X", "pid": 0, "tid": 0,
+                    "ts": int((start - self.start) * 1e6), "dur": int(duration * 1e6), "args": args or {}}
+
+        events = [event(self.name, self.start, self.duration)]
+        for command, (filename, line, function), start, duration in self.events or []:
+            events.append(event(command, start, duration,
+                                {"site": "{0}:{1}".format(os.path.basename(filename), line), "function": function}))
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def writeChromeTrace(self, path):
+        with open(path, "w") as f:
+            json.dump(self.chromeTrace(), f, separators=(",", ":"))
+
+
+def _wrap(command, function, profile):
+    def wrapper(*args, **kwargs):
+        caller = sys._getframe(1)
+        site = (caller.f_code.co_filename, caller.f_lineno, caller.f_code.co_name)
+        start = time.time()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            profile.record(command, site, start, time.time() - start)
+    wrapper.__name__ = function.__name__
+    wrapper.__doc__ = function.__doc__
+    return wrapper
+
+
+def _module(command):
+    if command.startswith("mel."):
+        return mel, command[4:]
+    return mc, command
+
+
+@contextlib.contextmanager
+def profiled(name="snippet", commands=COMMANDS, trace=None, verbose=True):
+    """ Profile the Maya commands called within the `with` block.
+
+    The commands are only wrapped during the block, so there's no overhead at all when not profiling.
+
+        with profiled("addVrayObjectIds", trace="/tmp/addVrayObjectIds.json"):
+            addVrayObjectIds()
+
+    :param name: The name of the profiled operation.
+    :type  name: str
+
+    :param commands: The `maya.cmds` commands to profile, prefix with "mel." for `maya.mel` functions.
+    :type  commands: list
+
+    :param trace: If given the calls are written to this path as Chrome trace JSON after the block.
+    :type  trace: str
+
+    :param verbose: If True the summary is printed after the block.
+    :type  verbose: bool
+
+    :rtype: CommandProfile
+    """
+    profile = CommandProfile(name, trace=bool(trace))
+    originals = []
+    for command in commands:
+        module, attr = _module(command)
+        function = getattr(module, attr, None)
+        if function is None:
+            continue
+        originals.append((module, attr, function))
+        setattr(module, attr, _wrap(command, function, profile))
+    try:
+        yield profile
+    finally:
+        for module, attr, function in reversed(originals):
+            setattr(module, attr, function)
+        profile.end = time.time()
+        if trace:
+            profile.writeChromeTrace(trace)
+        if verbose:
+            print profile.summary()
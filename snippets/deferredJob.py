@@ -0,0 +1,120 @@
+import maya.cmds as mc
+import maya.utils as mutils
+import time
+
+
+class DeferredJob(object):
+    """ Process a long list of items in small chunks while Maya is idle, so the UI stays responsive.
+
+    Each chunk is run with `maya.utils.executeDeferred`, in between Maya handles its UI events. The chunk
+    size is adjusted after every chunk from the measured time per item so a chunk takes about `budget`
+    seconds. Progress is shown in Maya's progress window and pressing Escape cancels the job, in which case
+    the chunks that were already applied are rolled back (last chunk first).
+
+    :param items: The items to process.
+    :type  items: list
+
+    :param apply: Function that processes a chunk (a list of items), its return value is passed to `rollback`.
+    :type  apply: callable
+
+    :param rollback: Function called with (chunk, result of apply) to revert an applied chunk on cancel.
+    :type  rollback: callable or None
+
+    :param budget: The time in seconds a chunk should take.
+    :type  budget: float
+
+    :param chunk_size: The size of the first chunk, before anything is measured.
+    :type  chunk_size: int
+
+    :param title: The title of the progress window.
+    :type  title: str
+
+    :param on_finish: Called with the job when it's done or cancelled (and rolled back).
+    :type  on_finish: callable or None
+    """
+    def __init__(self, items, apply, rollback=None, budget=0.05, chunk_size=50, max_chunk_size=5000,
+                 title="Processing", on_finish=None):
+        self.items = list(items)
+        self.apply = apply
+        self.rollback = rollback
+        self.budget = budget
+        self.chunk_size = chunk_size
+        self.max_chunk_size = max_chunk_size
+        self.title = title
+        self.on_finish = on_finish
+
+        self.status = "pending"
+        self.index = 0
+        self.seconds = 0.0
+        self.chunks = 0
+        self._applied = []
+        self._cost = None
+
+    @property
+    def progress(self):
+        """ The fraction of the items that is processed. """
+        return float(self.index) / len(self.items) if self.items else 1.0
+
+    def start(self):
+        """ Open the progress window and schedule the first chunk. """
+        if self.status != "pending":
+            raise RuntimeError("The job was already started")
+        self.status = "running"
+        mc.progressWindow(title=self.title, progress=0, maxValue=max(1, len(self.items)),
+                          status="{0} items".format(len(self.items)), isInterruptable=True)
+        mutils.executeDeferred(self._step)
+        return self
+
+    def cancel(self):
+        """ Cancel the job, the next chunk rolls back what was applied. """
+        if self.status == "running":
+            self.status = "cancelling"
+
+    def _step(self):
+        if self.status == "running" and mc.progressWindow(query=True, isCancelled=True):
+            self.status = "cancelling"
+        if self.status == "cancelling":
+            self._rollback()
+            return
+
+        chunk = self.items[self.index:self.index + self.chunk_size]
+        start_time = time.time()
+        try:
+            result = self.apply(chunk)
+        except Exception:
+            # Don't leave half an operation behind
+            self._rollback()
+            raise
+        duration = time.time() - start_time
+        self._applied.append((chunk, result))
+        self.index += len(chunk)
+        self.seconds += duration
+        self.chunks += 1
+
+        # Smooth the measured cost per item so one slow chunk doesn't shrink the chunks too much
+        cost = duration / max(1, len(chunk))
+        self._cost = cost if self._cost is None else self._cost * 0.5 + cost * 0.5
+        if self._cost > 0:
+            self.chunk_size = max(1, min(self.max_chunk_size, int(self.budget / self._cost)))
+
+        if self.index < len(self.items):
+            mc.progressWindow(edit=True, progress=self.index,
+                              status="{0}/{1} items".format(self.index, len(self.items)))
+            mutils.executeDeferred(self._step)
+        else:
+            self._finish("done")
+
+    def _rollback(self):
+        if self.rollback is not None:
+            while self._applied:
+                chunk, result = self._applied.pop()
+                self.rollback(chunk, result)
+        del self._applied[:]
+        self.index = 0
+        self._finish("cancelled")
+
+    def _finish(self, status):
+        self.status = status
+        mc.progressWindow(endProgress=True)
+        if self.on_finish is not None:
+            self.on_finish(self)
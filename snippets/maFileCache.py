@@ -0,0 +1,90 @@
+import json
+import os
+
+from maSceneFile import replaceFile
+
+
+# The sidecar file in each directory of fixed scenes
+CACHE_NAME = ".vfbSACache.json"
+# Bump when the layout of the sidecar file changes
+CACHE_FORMAT = 2
+
+CLEAN = "clean"
+FIXED = "fixed"
+
+
+class FileStateCache(object):
+    """ Remembers which .ma files had no .vfbSA left, in a sidecar file per directory.
+
+    An entry is keyed by file name and holds the size and modification time of the file with its state (`CLEAN`
+    or `FIXED`). A file whose size and modification time still match is skipped without reading it. Any other
+    file is scanned again: an edit can keep the size, and only reading all of it tells (which costs about as much
+    as the scan itself).
+    """
+    def __init__(self):
+        # directory -> {"entries": {name: entry}, "changed": bool}
+        self._directories = {}
+
+    def _directory(self, directory):
+        cache = self._directories.get(directory)
+        if cache is None:
+            entries = {}
+            try:
+                with open(os.path.join(directory, CACHE_NAME)) as f:
+                    data = json.load(f)
+                if data.get("format") == CACHE_FORMAT:
+                    entries = data["entries"]
+            except (IOError, OSError, ValueError):
+                pass
+            cache = self._directories[directory] = {"entries": entries, "changed": False}
+        return cache
+
+    def lookup(self, path):
+        """ Return the recorded state of the file if it didn't change since, else None.
+
+        :rtype: str or None
+        """
+        directory, name = os.path.split(os.path.abspath(path))
+        cache = self._directory(directory)
+        entry = cache["entries"].get(name)
+        if entry is None:
+            return None
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        if stat.st_size != entry["size"] or stat.st_mtime != entry["mtime"]:
+            return None
+        return entry["state"]
+
+    def record(self, path, state):
+        """ Record the state of a file as it is now on disk. """
+        directory, name = os.path.split(os.path.abspath(path))
+        cache = self._directory(directory)
+        stat = os.stat(path)
+        cache["entries"][name] = {"size": stat.st_size, "mtime": stat.st_mtime, "state": state}
+        cache["changed"] = True
+
+    def forget(self, path):
+        directory, name = os.path.split(os.path.abspath(path))
+        cache = self._directory(directory)
+        if cache["entries"].pop(name, None) is not None:
+            cache["changed"] = True
+
+    def save(self):
+        """ Write the changed sidecar files. Directories that can't be written to are skipped. """
+        for directory, cache in self._directories.items():
+            if not cache["changed"]:
+                continue
+            path = os.path.join(directory, CACHE_NAME)
+            # Per process, runs on the same directory can save at the same time
+            temp_path = "{0}.{1}.tmp".format(path, os.getpid())
+            try:
+                with open(temp_path, "w") as f:
+                    json.dump({"format": CACHE_FORMAT, "entries": cache["entries"]}, f, indent=1, sort_keys=True)
+                replaceFile(temp_path, path)
+            except (IOError, OSError):
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                continue
+            cache["changed"] = False
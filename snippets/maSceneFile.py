@@ -0,0 +1,743 @@
+import contextlib
+import fnmatch
+import gzip
+import mmap
+import os
+import re
+import shutil
+import tempfile
+import time
+
+
+VFBSA_MARKER = b'setAttr ".vfbSA"'
+GZIP_MAGIC = b"\x1f\x8b"
+
+# Rules only get to see the first bytes of a statement, so huge statements (like a corrupt .vfbSA array)
+# can be stripped or kept without ever holding them in memory completely.
+HEADER_SIZE = 4096
+
+_NON_SPACE = re.compile(br"\S")
+_QUOTE_OR_END = re.compile(br'[";]')
+_QUOTE_OR_ESCAPE = re.compile(br'["\\]')
+_TOKEN = re.compile(br'"((?:[^"\\]|\\.)*)"|([^\s";]+)', re.S)
+_MAGIC = re.compile(r"[*?[]")
+_VFBSA_STATEMENT = re.compile(br'setAttr "\.vfbSA"(?: -type "Int32Array")?[-\s\d]*;')
+
+_START, _STATEMENT, _COMMENT = range(3)
+
+
+class _NullWriter(object):
+    """ File-like object that discards everything written to it (used for dry runs). """
+    def write(self, data):
+        pass
+
+
+class MaStatement(object):
+    """ A single MEL statement of a maya ASCII file as seen by a `MaRule`.
+
+    `arguments` holds the positional arguments (unquoted), `flags` maps the flags to their value (or None).
+    `node_type` and `node_name` describe the node the statement applies to (the last createNode or select).
+    `text` holds the complete statement including its leading whitespace, but only for rewrite rules.
+    """
+    __slots__ = ("command", "arguments", "flags", "node_type", "node_name", "text")
+
+    def __init__(self, command, arguments=None, flags=None, node_type=None, node_name=None):
+        self.command = command
+        self.arguments = arguments or []
+        self.flags = flags or {}
+        self.node_type = node_type
+        self.node_name = node_name
+        self.text = None
+
+    def __repr__(self):
+        return "MaStatement({0!r}, {1!r})".format(self.command, self.arguments[:1])
+
+
+class MaRule(object):
+    """ Strip or rewrite the statements of a maya ASCII file matching a command and (optionally) more.
+
+    Examples:
+        MaRule("setAttr", ".vfbSA", node_type="VRaySettingsNode")   # strip the frame buffer settings
+        MaRule("fileInfo", "license")                               # strip a stale fileInfo entry
+        MaRule("requires", "Mayatomr")                              # strip a dead plug-in requirement
+
+    :param command: The MEL command of the statement, eg. "setAttr", "createNode", "fileInfo" or "requires".
+                    Use "//" to match comment lines.
+    :type  command: str
+
+    :param argument: fnmatch pattern for the first positional argument. For setAttr that's the attribute
+                     (like ".vfbSA"), for fileInfo the key, for requires the plug-in and for createNode the type.
+    :type  argument: str or None
+
+    :param node_type: fnmatch pattern for the type of the node the statement applies to.
+    :type  node_type: str or None
+
+    :param rewrite: If None matching statements are stripped. Otherwise a callable that gets the `MaStatement`
+                    (with its `text`) and returns the text to write instead, or None to strip it after all.
+    :type  rewrite: callable or None
+    """
+    def __init__(self, command, argument=None, node_type=None, rewrite=None):
+        self.command = command
+        self.argument = argument
+        self.node_type = node_type
+        self.rewrite = rewrite
+
+    def matches(self, statement):
+        if self.node_type is not None and not fnmatch.fnmatchcase(statement.node_type or "", self.node_type):
+            return False
+        if self.argument is not None:
+            if not statement.arguments or not fnmatch.fnmatchcase(statement.arguments[0], self.argument):
+                return False
+        return True
+
+    def __repr__(self):
+        return "MaRule({0!r}, {1!r})".format(self.command, self.argument)
+
+
+VFBSA_RULE = MaRule("setAttr", ".vfbSA")
+
+
+def parseMaStatement(head):
+    """ Parse the command, positional arguments and flags from the (start of the) text of a MEL statement.
+
+    :param head: The statement text, it may be cut off.
+    :type  head: str
+
+    :rtype: MaStatement
+    """
+    command = None
+    arguments = []
+    flags = {}
+    flag = None
+    for match in _TOKEN.finditer(head):
+        quoted, word = match.groups()
+        if command is None:
+            command = word if word is not None else quoted
+            continue
+
+        if word is not None and word[:1] == b"-" and word[1:2].isalpha():
+            flag = word
+            flags[flag] = None
+            continue
+
+        value = quoted if quoted is not None else word
+        if flag is not None:
+            flags[flag] = value
+            flag = None
+        else:
+            arguments.append(value)
+
+    return MaStatement(command, arguments, flags)
+
+
+def _scan(data, pos, state):
+    """ Precise scan for the end of the statement at `pos`, honouring strings, escapes and comment lines.
+
+    :param state: [mode, in_string, escape] of the scan so far, updated in place so the scan can continue
+                  in the next chunk.
+
+    :return: The index right after the end of the statement or -1 if it doesn't end within `data`.
+    :rtype: int
+    """
+    size = len(data)
+    mode, in_string, escape = state
+    while pos < size:
+        if mode == _START:
+            match = _NON_SPACE.search(data, pos)
+            if match is None:
+                break
+            pos = match.start()
+            mode = _COMMENT if data.startswith(b"//", pos) else _STATEMENT
+
+        elif mode == _COMMENT:
+            eol = data.find(b"\n", pos)
+            if eol == -1:
+                break
+            state[:] = [_START, False, False]
+            return eol
+
+        elif escape:
+            pos += 1
+            escape = False
+
+        elif in_string:
+            match = _QUOTE_OR_ESCAPE.search(data, pos)
+            if match is None:
+                break
+            pos = match.end()
+            if data[pos - 1:pos] == b"\\":
+                escape = True
+            else:
+                in_string = False
+
+        else:
+            match = _QUOTE_OR_END.search(data, pos)
+            if match is None:
+                break
+            pos = match.end()
+            if data[pos - 1:pos] == b";":
+                state[:] = [_START, False, False]
+                return pos
+            in_string = True
+
+    state[:] = [mode, in_string, escape]
+    return -1
+
+
+def _statementEnd(data, pos):
+    """ Find the end of the statement at `pos`, or -1 if it doesn't end within `data`.
+
+    Most statements hold no escapes, comments or semicolons inside strings, those are delimited with
+    a few quick byte searches. Only the others go through the precise `_scan`.
+    """
+    semi = data.find(b";", pos)
+    if semi != -1:
+        end = semi + 1
+        if (data.count(b'"', pos, end) % 2 == 0 and data.find(b"\\", pos, end) == -1 and
+                data.find(b"//", pos, end) == -1):
+            return end
+    return _scan(data, pos, [_START, False, False])
+
+
+class _LongStatement(object):
+    """ State of a statement that is too big to buffer, it's streamed through while scanning for its end. """
+    def __init__(self, match, state):
+        self.match = match
+        self.state = state
+        self.pieces = []
+
+
+class _RuleEngine(object):
+    """ Single pass streaming tokenizer that applies all `MaRule` instances to the statements of a .ma file.
+
+    Statements are split on semicolons outside of strings, comment lines end at the newline. Leading
+    whitespace belongs to the statement that follows it, so stripping a statement leaves the file well formed.
+    Only statements starting with a command that has rules (or createNode/select for node type rules) are
+    parsed at all, everything else is copied through in slices.
+    """
+    def __init__(self, fout, rules):
+        self.fout = fout
+        self.rules = {}
+        for index, rule in enumerate(rules):
+            self.rules.setdefault(rule.command, []).append((index, rule))
+
+        # Literal arguments we can quickly search for before parsing a statement, None if a rule needs parsing
+        self.needles = {}
+        for command, candidates in self.rules.items():
+            needles = [rule.argument for index, rule in candidates]
+            if all(needle is not None and not _MAGIC.search(needle) for needle in needles):
+                self.needles[command] = tuple(needles)
+
+        self.track_nodes = any(rule.node_type is not None for rule in rules)
+        commands = set(self.rules) - set([b"//"])
+        if self.track_nodes:
+            commands.update([b"createNode", b"select"])
+        self.commands = tuple(commands)
+        self.comments = b"//" in self.rules
+
+        # Without node type and comment rules we only need to look at statements holding one of the needles
+        self.skip_needles = None
+        if not self.track_nodes and not self.comments and len(self.needles) == len(self.rules):
+            self.skip_needles = tuple(set(needle for needles in self.needles.values() for needle in needles))
+
+        self.counts = [0] * len(rules)
+        self.removed = 0
+        self.node_type = None
+        self.node_name = None
+        self.tail = b""
+        self.long = None
+
+    def _match(self, data, pos, end):
+        """ Return (rule, statement) of the first rule matching the statement in data[pos:end] or None. """
+        first = _NON_SPACE.search(data, pos, end)
+        if first is None:
+            return None
+        start = first.start()
+
+        if data.startswith(b"//", start):
+            if not self.comments:
+                return None
+            command = b"//"
+            statement = MaStatement(command)
+        else:
+            if not data.startswith(self.commands, start):
+                return None
+            head_end = min(end, start + HEADER_SIZE)
+            command = data[start:head_end].split(None, 1)[0].rstrip(b";")
+            node_command = self.track_nodes and command in (b"createNode", b"select")
+            if not node_command:
+                if command not in self.rules:
+                    return None
+                needles = self.needles.get(command)
+                if needles is not None and not any(data.find(needle, start, head_end) != -1 for needle in needles):
+                    return None
+            statement = parseMaStatement(data[start:head_end])
+
+            if command == b"createNode":
+                self.node_type = statement.arguments[0] if statement.arguments else None
+                self.node_name = statement.flags.get(b"-n")
+            elif command == b"select":
+                self.node_type = None
+                self.node_name = statement.arguments[0] if statement.arguments else statement.flags.get(b"-ne")
+            statement.node_type = self.node_type
+            statement.node_name = self.node_name
+
+        for index, rule in self.rules.get(command, ()):
+            if rule.matches(statement):
+                self.counts[index] += 1
+                return rule, statement
+        return None
+
+    def _apply(self, match, text):
+        """ Strip or rewrite the complete statement `text`. """
+        rule, statement = match
+        if rule.rewrite is None:
+            self.removed += len(text)
+            return
+        statement.text = text
+        result = rule.rewrite(statement) or b""
+        self.fout.write(result)
+        self.removed += len(text) - len(result)
+
+    def _startLong(self, data):
+        """ Start streaming through a statement that didn't end within the buffered data. """
+        state = [_START, False, False]
+        _scan(data, 0, state)
+        self.long = _LongStatement(self._match(data, 0, len(data)), state)
+        self._streamLong(data)
+
+    def _streamLong(self, data):
+        match = self.long.match
+        if match is None:
+            self.fout.write(data)
+        elif match[0].rewrite is None:
+            self.removed += len(data)
+        else:
+            self.long.pieces.append(data)
+
+    def _finishLong(self):
+        long_statement, self.long = self.long, None
+        if long_statement.pieces:
+            self._apply(long_statement.match, b"".join(long_statement.pieces))
+
+    def _skip(self, data, pos):
+        """ Jump from `pos` to the start of the statement holding the next needle.
+
+        Without escapes and comments a semicolon is a statement boundary when an even amount of quotes
+        precede it, so all statements up to there can be skipped with a few byte searches.
+
+        :return: The position to continue from and the last escape or comment that prevented skipping (or -1).
+        :rtype: (int, int)
+        """
+        hits = [hit for hit in (data.find(needle, pos) for needle in self.skip_needles) if hit != -1]
+        limit = min(hits) if hits else len(data)
+        semi = data.rfind(b";", pos, limit)
+        if semi == -1:
+            return pos, -1
+
+        blocker = max(data.rfind(b"\\", pos, semi), data.rfind(b"//", pos, semi))
+        if blocker != -1:
+            # Go through the statements one by one until we're past the escape or comment
+            return pos, blocker
+
+        # The last semicolon could be inside a string, try a few earlier ones before giving up
+        for attempt in range(8):
+            if data.count(b'"', pos, semi) % 2 == 0:
+                return semi + 1, -1
+            semi = data.rfind(b";", pos, semi)
+            if semi == -1:
+                break
+        return pos, limit
+
+    def feed(self, chunk):
+        """ Process the next chunk of data of the file. """
+        pos = 0
+        if self.long is not None:
+            end = _scan(chunk, 0, self.long.state)
+            self._streamLong(chunk if end == -1 else chunk[:end])
+            if end == -1:
+                return
+            self._finishLong()
+            data = chunk
+            pos = end
+        else:
+            data = self.tail + chunk if self.tail else chunk
+
+        # Kept statements aren't written one by one, but in one slice up to the next changed statement
+        flushed = pos
+        size = len(data)
+        blocker = -1
+        while pos < size:
+            if self.skip_needles is not None and pos > blocker:
+                pos, blocker = self._skip(data, pos)
+            end = _statementEnd(data, pos)
+            if end == -1:
+                break
+            match = self._match(data, pos, end) if self.commands or self.comments else None
+            if match is not None:
+                self.fout.write(data[flushed:pos])
+                self._apply(match, data[pos:end])
+                flushed = end
+            pos = end
+        self.fout.write(data[flushed:pos])
+
+        rest = data[pos:]
+        if len(rest) > HEADER_SIZE and _NON_SPACE.search(rest):
+            self.tail = b""
+            self._startLong(rest)
+        else:
+            self.tail = rest
+
+    def close(self):
+        """ Flush whatever is left after the last complete statement. """
+        if self.long is not None:
+            self._finishLong()
+        elif self.tail:
+            tail, self.tail = self.tail, b""
+            match = self._match(tail, 0, len(tail))
+            if match is None:
+                self.fout.write(tail)
+            else:
+                self._apply(match, tail)
+
+
+def applyMaRulesToStream(fin, fout, rules, chunk_size=8 * 1024 * 1024):
+    """ Copy a maya ASCII stream from `fin` to `fout` applying all `rules` in a single pass.
+
+    :return: The amount of bytes read, the amount of bytes removed and the amount of matches per rule.
+    :rtype: (int, int, list of int)
+    """
+    engine = _RuleEngine(fout, rules)
+    total = 0
+    while True:
+        chunk = fin.read(chunk_size)
+        if not chunk:
+            break
+        total += len(chunk)
+        engine.feed(chunk)
+    engine.close()
+
+    return total, engine.removed, engine.counts
+
+
+def replaceFile(src, dst):
+    """ Move `src` over `dst`, atomically where the platform allows it.
+
+    Windows refuses to rename onto an existing file, only there we fall back to removing `dst` first (and
+    another process may briefly see no file). Elsewhere a failed rename raises the OSError.
+    """
+    try:
+        os.rename(src, dst)
+    except OSError:
+        if os.name != "nt" or not os.path.exists(dst):
+            raise
+        os.remove(dst)
+        os.rename(src, dst)
+
+
+def _writeTemp(path, write, compress=False):
+    """ Call `write` with a file object for a temporary file next to `path`.
+
+    :param compress: If True the data written is gzip compressed.
+    :type  compress: bool
+
+    :return: The path of the temporary file.
+    :rtype: str
+    """
+    fd, tmp_path = tempfile.mkstemp(suffix=".tmp", prefix=".maSceneFile_", dir=os.path.dirname(os.path.abspath(path)))
+    try:
+        with os.fdopen(fd, "wb") as fout:
+            if compress:
+                with gzip.GzipFile(filename="", mode="wb", fileobj=fout) as gzout:
+                    write(gzout)
+            else:
+                write(fout)
+    except Exception:
+        os.remove(tmp_path)
+        raise
+    return tmp_path
+
+
+def _commitTemp(tmp_path, path):
+    """ Replace `path` with the temporary file written by `_writeTemp`. """
+    try:
+        shutil.copymode(path, tmp_path)
+        replaceFile(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _report(path, removed, statements, total, start_time):
+    duration = max(time.time() - start_time, 1e-6)
+    print "Removed {0} bytes in {1} statements from {2} ({3:.1f} MB at {4:.1f} MB/s)".format(
+        removed, statements, path, total / 1048576.0, total / 1048576.0 / duration)
+
+
+def isGzip(path):
+    """ Whether the file at `path` is gzip compressed (checked by its magic bytes, not the extension). """
+    with open(path, "rb") as fin:
+        return fin.read(2) == GZIP_MAGIC
+
+
+def openMaFile(path):
+    """ Open a (possibly gzip compressed) maya ASCII file for reading bytes. """
+    return gzip.open(path, "rb") if isGzip(path) else open(path, "rb")
+
+
+@contextlib.contextmanager
+def _mapFile(path):
+    """ Memory map a file read-only. Yields None for an empty file, those can't be mapped. """
+    with open(path, "rb") as fin:
+        if not os.fstat(fin.fileno()).st_size:
+            yield None
+            return
+        mapped = mmap.mmap(fin.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            yield mapped
+        finally:
+            mapped.close()
+
+
+def applyMaRules(path, rules, chunk_size=8 * 1024 * 1024, dry_run=False, verbose=True):
+    """ Strip or rewrite statements of a .ma file with the given rules, reading the file only once.
+
+    The file is streamed in chunks into a temporary file next to it, which then replaces the original.
+    This way memory usage stays flat no matter how big the scene file is.
+    Gzip compressed files are streamed through the (de)compression and stay compressed.
+    If nothing changed the original file is left untouched.
+
+    :param path: Path to the maya ASCII file to change.
+    :type  path: str
+
+    :param rules: The rules to apply, see `MaRule`.
+    :type  rules: list of MaRule
+
+    :param chunk_size: The amount of bytes read per chunk.
+    :type  chunk_size: int
+
+    :param dry_run: If True only count the bytes that would be removed, don't write anything.
+    :type  dry_run: bool
+
+    :param verbose: If True print the amount of bytes removed and the throughput.
+    :type  verbose: bool
+
+    :rtype: (int, list of int)
+    :return: The amount of bytes removed from the file and the amount of statements matched per rule.
+    """
+    start_time = time.time()
+    result = []
+
+    def write(fout):
+        with openMaFile(path) as fin:
+            result.extend(applyMaRulesToStream(fin, fout, rules, chunk_size))
+
+    if dry_run:
+        write(_NullWriter())
+    else:
+        tmp_path = _writeTemp(path, write, compress=isGzip(path))
+        if any(result[2]):
+            _commitTemp(tmp_path, path)
+        else:
+            os.remove(tmp_path)
+
+    total, removed, counts = result
+    if verbose:
+        _report(path, removed, sum(counts), total, start_time)
+
+    return removed, counts
+
+
+def _findVfbSARanges(data):
+    """ Find the byte ranges of the .vfbSA statements in (memory mapped) .ma data.
+
+    The range of a statement includes its leading whitespace, exactly like the rule engine strips it.
+
+    :return: The (start, end) ranges, or None if a statement doesn't look like a plain Int32Array
+             (the rule engine has to take care of those).
+    :rtype: list of (int, int) or None
+    """
+    ranges = []
+    pos = 0
+    while True:
+        hit = data.find(VFBSA_MARKER, pos)
+        if hit == -1:
+            return ranges
+
+        match = _VFBSA_STATEMENT.match(data, hit)
+        # Only whitespace is allowed between the end of the previous statement and this one
+        start = data.rfind(b";", max(0, pos - 1, hit - HEADER_SIZE), hit) + 1
+        if match is None or not start or data[start:hit].strip():
+            return None
+
+        ranges.append((start, match.end()))
+        pos = match.end()
+
+
+def _copyRanges(data, fout, ranges, chunk_size):
+    """ Write all of `data` except for the given (sorted) ranges to `fout` in slices of at most `chunk_size`. """
+    pos = 0
+    for start, end in ranges + [(len(data), len(data))]:
+        while pos < start:
+            stop = min(start, pos + chunk_size)
+            fout.write(data[pos:stop])
+            pos = stop
+        pos = end
+
+
+def findVfbSARanges(path):
+    """ Find the byte ranges of the .vfbSA statements in an uncompressed .ma file through mmap.
+
+    :param path: Path to the maya ASCII file.
+    :type  path: str
+
+    :return: The (start, end) ranges, or None if a statement needs the full rule engine to be removed.
+    :rtype: list of (int, int) or None
+    """
+    with _mapFile(path) as data:
+        return _findVfbSARanges(data) if data is not None else []
+
+
+def containsVfbSA(path, chunk_size=8 * 1024 * 1024):
+    """ Quick byte scan whether a .ma file holds a .vfbSA statement at all.
+
+    Uncompressed files are memory mapped and searched in one go, gzip compressed ones are streamed.
+
+    :param path: Path to the maya ASCII file.
+    :type  path: str
+
+    :rtype: bool
+    """
+    if not isGzip(path):
+        with _mapFile(path) as data:
+            return data is not None and data.find(VFBSA_MARKER) != -1
+
+    overlap = len(VFBSA_MARKER) - 1
+    tail = b""
+    with openMaFile(path) as fin:
+        while True:
+            chunk = fin.read(chunk_size)
+            if not chunk:
+                return False
+            # Keep the end of the previous chunk in case the marker is split over two chunks
+            data = tail + chunk
+            if VFBSA_MARKER in data:
+                return True
+            tail = data[-overlap:]
+
+
+def removeVfbSA(path, chunk_size=8 * 1024 * 1024, dry_run=False, verbose=True):
+    """ Remove the setAttr ".vfbSA" statement(s) from a .ma file.
+
+    Uncompressed files are memory mapped to find the statements, after which only the untouched ranges
+    around them are copied (a file without statements isn't written at all). Gzip compressed files and
+    statements that don't look like a plain Int32Array go through `applyMaRules`.
+
+    :param path: Path to the maya ASCII file to fix, it may be gzip compressed.
+    :type  path: str
+
+    :rtype: int
+    :return: The amount of bytes removed from the file.
+    """
+    if not isGzip(path):
+        start_time = time.time()
+        tmp_path = None
+        with _mapFile(path) as data:
+            ranges = _findVfbSARanges(data) if data is not None else []
+            if ranges and not dry_run:
+                tmp_path = _writeTemp(path, lambda fout: _copyRanges(data, fout, ranges, chunk_size))
+            total = len(data) if data is not None else 0
+
+        # Replace the file only after the map is closed, Windows can't remove a mapped file
+        if tmp_path:
+            _commitTemp(tmp_path, path)
+
+        if ranges is not None:
+            removed = sum(end - start for start, end in ranges)
+            if verbose:
+                _report(path, removed, len(ranges), total, start_time)
+            return removed
+
+    removed, counts = applyMaRules(path, [VFBSA_RULE], chunk_size=chunk_size, dry_run=dry_run, verbose=verbose)
+    return removed
+
+
+def _arrayStatement(head):
+    """ Return (attribute, amount of elements) if the text is a setAttr of a data array, else None. """
+    # The text can run into the next statements, the values of a data array hold no semicolons
+    statement = parseMaStatement(head.split(b";", 1)[0])
+    if statement.command != b"setAttr" or not (statement.flags.get(b"-type") or b"").endswith(b"Array"):
+        return None
+    if len(statement.arguments) < 2 or not statement.arguments[1].isdigit():
+        return None
+    return statement.arguments[0].lstrip(b"."), int(statement.arguments[1])
+
+
+def _settingsStatements(data, pos):
+    """ Yield (start, end, data array) of the statements in (memory mapped) data from `pos` up to the next node.
+    The data array is the (attribute, amount of elements) of `_arrayStatement` or None.
+
+    Data array statements hold only numbers, so their end is the next semicolon. Other statements are looked
+    at in slices, mmap has no `count` for `_statementEnd` to use.
+    """
+    size = len(data)
+    while pos < size:
+        head = data[pos:pos + HEADER_SIZE]
+        stripped = head.lstrip()
+        if not stripped or stripped.startswith((b"createNode", b"select", b"connectAttr", b"relationship")):
+            return
+        array = _arrayStatement(stripped)
+        if array is not None:
+            end = data.find(b";", pos) + 1
+        else:
+            length = HEADER_SIZE
+            end = _statementEnd(head, 0)
+            while end == -1 and pos + length < size:
+                length *= 4
+                end = _statementEnd(data[pos:pos + length], 0)
+            end = pos + end if end != -1 else 0
+        if not end:
+            return
+        yield pos, end, array
+        pos = end
+
+
+def _findSettingsArrays(data):
+    found = []
+    pos = data.find(b"createNode VRaySettingsNode")
+    while pos != -1:
+        pos = data.find(b";", pos) + 1
+        for start, end, array in _settingsStatements(data, pos):
+            if array is not None:
+                found.append(array + (end - start,))
+            pos = end
+        pos = data.find(b"createNode VRaySettingsNode", pos)
+    return found
+
+
+def findSettingsArrays(path):
+    """ Return the size of each data array set on the V-ray settings node(s) of a .ma file, largest first.
+
+    Uncompressed files are memory mapped and only the statements of the settings node are looked at.
+    Gzip compressed files are streamed through the rule engine (which holds each array statement in memory).
+
+    :rtype: list of (str, int, int)
+    :return: The (attribute, amount of elements, bytes in the file) of each array.
+    """
+    if not isGzip(path):
+        with _mapFile(path) as data:
+            found = _findSettingsArrays(data) if data is not None else []
+    else:
+        found = []
+
+        def record(statement):
+            array = _arrayStatement(statement.text.lstrip()[:HEADER_SIZE])
+            if array is not None:
+                found.append(array + (len(statement.text),))
+            return statement.text
+
+        with openMaFile(path) as fin:
+            applyMaRulesToStream(fin, _NullWriter(), [MaRule("setAttr", node_type="VRaySettingsNode",
+                                                             rewrite=record)])
+    return sorted(found, key=lambda array: -array[2])
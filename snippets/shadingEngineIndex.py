@@ -0,0 +1,132 @@
+import maya.cmds as mc
+import maya.api.OpenMaya as om
+
+
+# The index is built once per scene and thrown away by Maya callbacks when shading assignments change
+_index = {"shapes": None, "materials": None}
+_callbacks = []
+
+
+def invalidate(*args):
+    """ Throw away the cached shading engine index, it's rebuilt on the next lookup. """
+    _index["shapes"] = None
+    _index["materials"] = None
+
+
+def _onConnection(src_plug, dst_plug, made, client_data=None):
+    # Only (dis)connections of shading engines change shading assignments
+    if _index["shapes"] is None:
+        return
+    if (src_plug.node().hasFn(om.MFn.kShadingEngine) or
+            dst_plug.node().hasFn(om.MFn.kShadingEngine)):
+        invalidate()
+
+
+def _onNameChanged(node, previous_name, client_data=None):
+    # The index is keyed by shading engine and material names
+    if _index["shapes"] is not None:
+        invalidate()
+
+
+def _installCallbacks():
+    if _callbacks:
+        return
+    _callbacks.append(om.MDGMessage.addConnectionCallback(_onConnection))
+    _callbacks.append(om.MNodeMessage.addNameChangedCallback(om.MObject(), _onNameChanged))
+    for message in (om.MSceneMessage.kAfterOpen, om.MSceneMessage.kAfterNew, om.MSceneMessage.kAfterImport,
+                    om.MSceneMessage.kAfterLoadReference, om.MSceneMessage.kAfterUnloadReference):
+        _callbacks.append(om.MSceneMessage.addCallback(message, invalidate))
+
+
+def uninstall():
+    """ Remove the Maya callbacks of the index and clear it. """
+    for callback in _callbacks:
+        om.MMessage.removeCallback(callback)
+    del _callbacks[:]
+    invalidate()
+
+
+def _uuids(nodes):
+    """ Return the uuids of the nodes with a single command call (uuids survive renames and reparenting). """
+    if not nodes:
+        return []
+    return mc.ls(nodes, uuid=True) or []
+
+
+def _uuidMap(nodes):
+    """ Map each of the nodes to its uuid, a shape can be listed more than once. """
+    unique = list(set(nodes))
+    uuids = _uuids(unique)
+    if len(uuids) != len(unique):
+        uuids = [mc.ls(node, uuid=True)[0] for node in unique]
+    return dict(zip(unique, uuids))
+
+
+def _buildIndex():
+    """ Index all shading engines of the scene: shape uuid -> shading engines and shading engine -> material. """
+    shapes = {}
+    materials = {}
+    shading_engines = mc.ls(type="shadingEngine") or []
+    if shading_engines:
+        # Per shading engine its surface shader, as (plug, node) pairs from one call
+        pairs = mc.listConnections(["{0}.surfaceShader".format(sg) for sg in shading_engines],
+                                   source=True, destination=False, connections=True) or []
+        for plug, material in zip(pairs[::2], pairs[1::2]):
+            materials[plug.split(".", 1)[0]] = material
+
+        # Per shading engine its members (whole objects and face assignments alike), from one call
+        pairs = mc.listConnections(["{0}.dagSetMembers".format(sg) for sg in shading_engines],
+                                   source=True, destination=False, connections=True, shapes=True) or []
+        uuids = _uuidMap(pairs[1::2])
+        for plug, member in zip(pairs[::2], pairs[1::2]):
+            shapes.setdefault(uuids[member], set()).add(plug.split(".", 1)[0])
+
+    _index["shapes"] = shapes
+    _index["materials"] = materials
+    _installCallbacks()
+
+
+def shadingEngineIndex():
+    """ Return the (cached) shading engine index of the current scene.
+
+    :rtype: (dict, dict)
+    :return: Shape uuid to the set of its shading engines and shading engine to its surface shader.
+    """
+    if _index["shapes"] is None:
+        _buildIndex()
+    return _index["shapes"], _index["materials"]
+
+
+def shadingEnginesFromNodes(nodes):
+    """ Return the shading engines assigned to the shapes of the given nodes (or their children).
+
+    :param nodes: Transforms, shapes or shading engines.
+    :type  nodes: list of str
+
+    :rtype: set of str
+    """
+    shapes_index, materials_index = shadingEngineIndex()
+    shading_engines = set(mc.ls(nodes, type="shadingEngine") or [])
+    shapes = mc.ls(nodes, dag=True, shapes=True, noIntermediate=True, long=True) or []
+    for uuid in _uuids(shapes):
+        shading_engines.update(shapes_index.get(uuid, ()))
+    return shading_engines
+
+
+def materialsFromNodes(nodes):
+    """ Return the materials assigned to the given nodes through shape -> shadingEngine -> surfaceShader only.
+
+    This doesn't walk any construction history, so it stays fast on deformed and rigged geometry.
+
+    :param nodes: Transforms, shapes or shading engines.
+    :type  nodes: list of str
+
+    :rtype: list of str
+    """
+    shapes_index, materials_index = shadingEngineIndex()
+    materials = set()
+    for shading_engine in shadingEnginesFromNodes(nodes):
+        material = materials_index.get(shading_engine)
+        if material:
+            materials.add(material)
+    return sorted(materials)
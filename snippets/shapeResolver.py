@@ -0,0 +1,79 @@
+import maya.cmds as mc
+import maya.api.OpenMaya as om
+
+
+# The shapes that can have the V-ray geometry attribute groups (subdivision, displacement, object ID)
+GEOMETRY_TYPES = ("mesh", "nurbsSurface")
+
+# Per node type the types it inherits from (itself included), looked up once per session
+_inherited = {}
+
+
+def _isType(type_name, types):
+    """ Return whether nodes of `type_name` are of any of the `types`, derived types included like `ls -type`. """
+    if type_name not in _inherited:
+        _inherited[type_name] = frozenset(mc.nodeType(type_name, isTypeName=True, inherited=True) or [type_name])
+    return not _inherited[type_name].isdisjoint(types)
+
+
+def resolveShapes(nodes=None, types=GEOMETRY_TYPES, intermediate=True):
+    """ Return the unique shapes of the given types in the hierarchies of the nodes.
+
+    This replaces `mc.ls(sl=1, s=1, dag=1, lf=1, o=1, long=True)` followed by a type filter. That lists every
+    DAG path below the selection, so a scatter with many instances of a few shapes returns each shape once
+    per instance. Here the hierarchy is walked once: a node (transform or shape) that was already visited
+    through another instance path isn't walked again and the types are filtered during the walk. Like `ls -type`
+    the types match derived node types too (eg. "surfaceShape" matches meshes and NURBS surfaces).
+
+    :param nodes: The nodes to walk (and include). If None the current selection is used.
+    :type  nodes: list of str or None
+
+    :param types: The node types of the shapes to return.
+    :type  types: tuple of str
+
+    :param intermediate: If True intermediate objects (eg. the original shapes of deformers) are included, as
+                         the `ls` it replaces did. Use False to skip them.
+    :type  intermediate: bool
+
+    :rtype: list of str
+    :return: The long name of each unique shape (through the first instance path that was found).
+    """
+    if nodes is None:
+        nodes = mc.ls(sl=1, long=True)
+    if not nodes:
+        return []
+
+    selection = om.MSelectionList()
+    for node in nodes:
+        selection.add(node)
+
+    types = set(types)
+    visited = set()
+    shapes = []
+    stack = []
+    for index in reversed(range(selection.length())):
+        try:
+            path = selection.getDagPath(index)
+        except TypeError:
+            # Not a DAG node, eg. a material or set
+            continue
+        stack.append((path.node(), path.fullPathName()))
+
+    while stack:
+        obj, path = stack.pop()
+        key = om.MFnDependencyNode(obj).uuid().asString()
+        if key in visited:
+            continue
+        visited.add(key)
+
+        fn = om.MFnDagNode(obj)
+        if _isType(fn.typeName, types):
+            if intermediate or not fn.isIntermediateObject:
+                shapes.append(path)
+            continue
+
+        for child_index in reversed(range(fn.childCount())):
+            child = fn.child(child_index)
+            stack.append((child, "{0}|{1}".format(path, om.MFnDependencyNode(child).name())))
+
+    return shapes
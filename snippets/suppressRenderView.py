@@ -0,0 +1,116 @@
+import maya.cmds as mc
+import maya.api.OpenMaya as om
+
+
+# The scene callbacks that apply the suppression to each opened or new scene
+_callbacks = []
+# Per settings node the "Hide Maya's render view" value the current scene had before it was suppressed
+_previous = {}
+
+
+def _hideRenderViewPlug(settings):
+    """ Return the plug of V-ray's "Hide Maya's render view" setting, None if the node or attribute is missing. """
+    if mc.objExists(settings) and mc.attributeQuery("hideRVOn", node=settings, exists=True):
+        return "{0}.hideRVOn".format(settings)
+    return None
+
+
+def _apply(state, settings):
+    plug = _hideRenderViewPlug(settings)
+    if plug is None:
+        return False
+    if mc.getAttr(plug) != state:
+        mc.setAttr(plug, state)
+    return True
+
+
+def _suppress(settings):
+    """ Turn the setting on, remembering the value it had to restore when disabled. """
+    plug = _hideRenderViewPlug(settings)
+    if plug is None:
+        return False
+    _previous.setdefault(settings, bool(mc.getAttr(plug)))
+    return _apply(True, settings)
+
+
+def _onScene(client_data):
+    # Scenes saved without the setting (or new scenes) would show the render view again
+    _previous.pop(client_data, None)
+    _suppress(client_data)
+
+
+def _installCallbacks(settings):
+    if _callbacks:
+        return
+    # Only on scene changes: a callback before renders would record the suppressed value as the scene's own (and
+    # V-ray renders don't send kBeforeSoftwareRender anyway)
+    for message in (om.MSceneMessage.kAfterOpen, om.MSceneMessage.kAfterNew):
+        _callbacks.append(om.MSceneMessage.addCallback(message, _onScene, settings))
+
+
+def uninstall():
+    """ Remove the scene callbacks, scenes opened afterwards keep their own setting. """
+    for callback in _callbacks:
+        om.MMessage.removeCallback(callback)
+    del _callbacks[:]
+
+
+def suppressRenderView(state=None, settings="vraySettings", renderViewWindow="renderViewWindow",
+                       dockControl="rendEditorDC"):
+    """ Stop Maya's render view from receiving the image while rendering with the V-ray frame buffer.
+
+    `forceHideRenderView` and `autoRenderViewMinimize` only hide the render view, it still receives every
+    render update. Here V-ray is told not to use Maya's render view at all (the "Hide Maya's render view"
+    setting of the V-ray frame buffer) and the render view window and the dock control of `forceHideRenderView`
+    are deleted. The setting is stored on the V-ray settings node, so it's applied again to each opened or new
+    scene (until disabled or `uninstall` is called). Disabling it restores the value the scene had before.
+
+    `benchmarks/benchmarkRenderView.py` compares the memory and render start time of the ways to hide the
+    render view in an interactive Maya session.
+
+    :param state: True to suppress the render view, False to restore it, None toggles it.
+    :type  state: bool or None
+
+    :param settings: The name of the V-ray settings node.
+    :type  settings: str
+
+    :param renderViewWindow: The name of the render view window.
+    :type  renderViewWindow: str
+
+    :param dockControl: The name of the dock control `forceHideRenderView` creates.
+    :type  dockControl: str
+
+    :rtype: bool
+    :return: The resulting state. False if this V-ray version has no setting to hide the render view.
+    """
+    if state is None:
+        plug = _hideRenderViewPlug(settings)
+        state = not (plug and mc.getAttr(plug))
+
+    if not state:
+        uninstall()
+        _apply(_previous.pop(settings, False), settings)
+        print "DISABLED SUPPRESS RENDER VIEW"
+        return False
+
+    if not mc.objExists(settings):
+        print "There's no {0} node, set V-ray as the current renderer first.".format(settings)
+        return False
+    if not _suppress(settings):
+        print "This V-ray version has no 'hideRVOn' setting on {0}, use forceHideRenderView or " \
+              "autoRenderViewMinimize instead.".format(settings)
+        return False
+    _installCallbacks(settings)
+
+    # Free what the render view (and the older hacks) hold on to
+    if mc.dockControl(dockControl, q=1, exists=True):
+        mc.deleteUI(dockControl)
+    if mc.window(renderViewWindow, q=1, exists=True):
+        mc.deleteUI(renderViewWindow)
+
+    print "ENABLED SUPPRESS RENDER VIEW"
+    return True
+
+
+if __name__ == "__main__":
+    suppressRenderView()
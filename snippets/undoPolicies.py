@@ -0,0 +1,117 @@
+import maya.cmds as mc
+import contextlib
+import time
+
+from vrayAttributeGroups import addVrayAttributeGroup, removeVrayAttributeGroup, snapshotValues, restoreValues
+
+
+# One undo step for the whole operation, every command still keeps its undo data within the chunk
+UNDO_CHUNK = "chunk"
+# No undo data at all, `restoreSnapshot` reverts the operation instead
+UNDO_OFF = "off"
+# Maya's default: one undo step per command (so per node)
+UNDO_NODE = "node"
+
+UNDO_POLICIES = (UNDO_CHUNK, UNDO_OFF, UNDO_NODE)
+
+# The snapshots of the operations that ran with undo disabled, last one last
+_snapshots = []
+
+
+def heapMemory():
+    """ Return the memory Maya uses for its heap in megabytes. """
+    return mc.memory(heapMemory=True, megaByte=True)
+
+
+@contextlib.contextmanager
+def undoPolicy(policy, name="bulkOperation"):
+    """ Run the commands within the `with` block under an undo policy.
+
+    :param policy: One of `UNDO_CHUNK`, `UNDO_OFF` or `UNDO_NODE`.
+    :type  policy: str
+
+    :param name: The name of the undo chunk.
+    :type  name: str
+    """
+    if policy not in UNDO_POLICIES:
+        raise ValueError("Unknown undo policy: {0}, use one of {1}".format(policy, ", ".join(UNDO_POLICIES)))
+
+    if policy == UNDO_CHUNK:
+        mc.undoInfo(openChunk=True, chunkName=name)
+        try:
+            yield
+        finally:
+            mc.undoInfo(closeChunk=True)
+    elif policy == UNDO_OFF:
+        # Without flush, so the undo queue from before the operation stays
+        state = mc.undoInfo(query=True, stateWithoutFlush=True)
+        mc.undoInfo(stateWithoutFlush=False)
+        try:
+            yield
+        finally:
+            mc.undoInfo(stateWithoutFlush=state)
+    else:
+        yield
+
+
+def bulkAddVrayAttributeGroup(nodes, group, values=None, undo=UNDO_CHUNK, verbose=True):
+    """ Add a V-ray attribute group to many nodes under an undo policy and measure its memory cost.
+
+    Every `vray addAttributesFromGroup` and `setAttr` adds an entry to Maya's undo queue which, on large
+    selections, adds up to hundreds of megabytes. With `UNDO_CHUNK` it's one undo step, with `UNDO_OFF`
+    nothing is recorded and a snapshot (the nodes the group was added to and the values that were
+    overwritten) is kept instead, revert it with `restoreSnapshot`.
+
+    :param nodes: The nodes to add the attribute group to.
+    :type  nodes: list of str
+
+    :param group: The attribute group, eg. "vray_subdivision" or "vray_objectID".
+    :type  group: str
+
+    :param values: Attribute values to set on all nodes after the group is added, eg. {"vrayObjectID": 5}.
+    :type  values: dict or None
+
+    :param undo: The undo policy, one of `UNDO_CHUNK`, `UNDO_OFF` or `UNDO_NODE`.
+    :type  undo: str
+
+    :param verbose: If True print the time and memory change.
+    :type  verbose: bool
+
+    :rtype: dict
+    :return: The counts of `vrayAttributeGroups.addVrayAttributeGroup` plus the "seconds" it took and the
+             change in heap "memory" in megabytes.
+    """
+    values = values or {}
+    memory_before = heapMemory()
+    start_time = time.time()
+
+    with undoPolicy(undo, name="add_{0}".format(group)):
+        if undo == UNDO_OFF:
+            snapshot = snapshotValues(nodes, sorted(values)) if values else []
+            added = []
+            counts = addVrayAttributeGroup(nodes, group, values, added=added)
+            _snapshots.append((group, added, snapshot))
+        else:
+            counts = addVrayAttributeGroup(nodes, group, values)
+
+    counts["seconds"] = time.time() - start_time
+    counts["memory"] = heapMemory() - memory_before
+    if verbose:
+        print "Added {0} to {1} nodes with undo policy '{2}' in {3:.2f} seconds, memory change: {4:+.1f} MB".format(
+            group, counts["added"], undo, counts["seconds"], counts["memory"])
+    return counts
+
+
+def restoreSnapshot():
+    """ Revert the last operation that ran with undo disabled (`UNDO_OFF`).
+
+    :rtype: bool
+    :return: Whether there was a snapshot to restore.
+    """
+    if not _snapshots:
+        return False
+    group, added, snapshot = _snapshots.pop()
+    with undoPolicy(UNDO_OFF):
+        removeVrayAttributeGroup(added, group)
+        restoreValues(snapshot)
+    return True
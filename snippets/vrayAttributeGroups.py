@@ -0,0 +1,217 @@
+import maya.cmds as mc
+import maya.mel as mel
+
+from vrayAttributeIndex import checkGroup, groupAdded, markChanged
+from vrayCatalog import groupInfo
+
+
+# The characters to escape in a MEL string, the backslash first
+_MEL_ESCAPES = (("\\", "\\\\"), ('"', '\\"'), ("\n", "\\n"), ("\r", "\\r"), ("\t", "\\t"))
+
+
+def _melValue(value):
+    """ Format a python value as the value (and type flag) of a MEL setAttr statement. """
+    if isinstance(value, (bool, int, long)):
+        # str(), as the repr of a long ends with an "L"
+        return str(int(value))
+    if isinstance(value, float):
+        return "%r" % value
+    if isinstance(value, basestring):
+        for char, escaped in _MEL_ESCAPES:
+            value = value.replace(char, escaped)
+        return '-type "string" "{0}"'.format(value)
+    if isinstance(value, (list, tuple)):
+        # Compound values like colors, as returned by getAttr: [(r, g, b)]
+        return " ".join(_melValue(item) for item in value)
+    raise TypeError("Can't set a value of type {0} through the attribute group engine".format(type(value)))
+
+
+def uniqueNodeUuids(nodes):
+    """ Return (long name, uuid) pairs of the unique nodes, see `uniqueNodes`. """
+    paths = mc.ls(nodes, long=True) or []
+    if not paths:
+        return []
+
+    uuids = mc.ls(paths, uuid=True) or []
+    if len(uuids) != len(paths):
+        uuids = [mc.ls(path, uuid=True)[0] for path in paths]
+
+    unique = []
+    seen = set()
+    for path, uuid in zip(paths, uuids):
+        if uuid not in seen:
+            seen.add(uuid)
+            unique.append((path, uuid))
+    return unique
+
+
+def uniqueNodes(nodes):
+    """ Remove duplicate nodes, whether they're listed by different names or as different instance paths.
+
+    :param nodes: Node names (short or long) or DAG paths.
+    :type  nodes: list of str
+
+    :rtype: list of str
+    :return: Long names of the unique nodes, in the order they were first found.
+    """
+    return [path for path, uuid in uniqueNodeUuids(nodes)]
+
+
+def addVrayAttributeGroup(nodes, group, values=None, batch_size=500, added=None):
+    """ Add a V-ray attribute group to many nodes at once and (optionally) set attribute values.
+
+    Duplicate nodes (long/short names, instances) are processed only once, nodes that already have the
+    group are skipped and the remaining commands are sent to Maya as MEL in batches of `batch_size` nodes
+    instead of one Python command call per node.
+
+    :param nodes: The nodes to add the attribute group to.
+    :type  nodes: list of str
+
+    :param group: The attribute group, eg. "vray_subdivision" or "vray_objectID".
+    :type  group: str
+
+    :param values: Attribute values to set on all nodes after the group is added, eg. {"vrayObjectID": 5}.
+    :type  values: dict or None
+
+    :param batch_size: The amount of nodes per MEL batch.
+    :type  batch_size: int
+
+    :param added: If given the long names of the nodes the group is added to are appended to this list.
+    :type  added: list or None
+
+    :raises ValueError: If the group isn't a V-ray attribute group (according to `vrayCatalog`).
+
+    :rtype: dict
+    :return: The amount of nodes the group was "added" to, "skipped" because they had it already and
+             the amount of attribute values "set".
+    """
+    info = groupInfo(group)
+    if not info["nodeTypes"]:
+        raise ValueError("Unknown V-ray attribute group: {0}".format(group))
+
+    values = values or {}
+    nodes = uniqueNodeUuids(nodes)
+
+    # The nodes that have the group already. Checked in the scene rather than taken from the index (see
+    # `vrayAttributeIndex`): another tool may have removed the group, a skipped node would then fail the batch
+    existing = checkGroup(group, nodes)
+
+    set_values = [(attr, _melValue(value)) for attr, value in sorted(values.items())]
+    counts = {"added": 0, "skipped": 0, "set": 0}
+    added_nodes = []
+    for index in range(0, len(nodes), batch_size):
+        statements = []
+        for node, uuid in nodes[index:index + batch_size]:
+            if uuid in existing:
+                counts["skipped"] += 1
+            else:
+                statements.append('vray addAttributesFromGroup "{0}" {1} 1;'.format(node, group))
+                counts["added"] += 1
+                added_nodes.append((node, uuid))
+            for attr, value in set_values:
+                statements.append('setAttr "{0}.{1}" {2};'.format(node, attr, value))
+                counts["set"] += 1
+
+        if statements:
+            mel.eval("\n".join(statements))
+
+    groupAdded(group, added_nodes)
+    if added is not None:
+        added.extend(node for node, uuid in added_nodes)
+    return counts
+
+
+def setAttributeValues(plug_values, batch_size=500):
+    """ Set a (different) value on many plugs at once, in MEL batches of `batch_size` plugs.
+
+    :param plug_values: (plug, value) pairs, eg. [("pCubeShape1.vrayObjectID", 3)].
+    :type  plug_values: list of tuple
+
+    :rtype: int
+    :return: The amount of values set.
+    """
+    plug_values = [(plug, _melValue(value)) for plug, value in plug_values]
+    for index in range(0, len(plug_values), batch_size):
+        mel.eval("\n".join('setAttr "{0}" {1};'.format(plug, value)
+                           for plug, value in plug_values[index:index + batch_size]))
+    return len(plug_values)
+
+def removeVrayAttributeGroup(nodes, group, batch_size=500):
+    """ Remove a V-ray attribute group from many nodes at once, in MEL batches of `batch_size` nodes.
+
+    :param nodes: The nodes to remove the attribute group from.
+    :type  nodes: list of str
+
+    :param group: The attribute group, eg. "vray_subdivision" or "vray_objectID".
+    :type  group: str
+    """
+    for index in range(0, len(nodes), batch_size):
+        mel.eval("\n".join('vray addAttributesFromGroup "{0}" {1} 0;'.format(node, group)
+                           for node in nodes[index:index + batch_size]))
+    if nodes:
+        # The attribute index has no callbacks per node, it checks these nodes again on its next lookup
+        markChanged(mc.ls(nodes, uuid=True) or [])
+
+
+def snapshotValues(nodes, attrs):
+    """ Return (plug, value) of the attributes that already exist on the nodes, see `restoreValues`.
+
+    :rtype: list of tuple
+    """
+    plugs = mc.ls(["{0}.{1}".format(node, attr) for node in nodes for attr in attrs]) or []
+    return [(plug, mc.getAttr(plug)) for plug in plugs]
+
+
+def restoreValues(snapshot):
+    """ Set the values of a `snapshotValues` snapshot back. """
+    for plug, value in snapshot:
+        if isinstance(value, list):
+            # Compound attributes (like colors) are returned as [(r, g, b)]
+            mc.setAttr(plug, *value[0])
+        elif isinstance(value, basestring):
+            mc.setAttr(plug, value, type="string")
+        else:
+            mc.setAttr(plug, value)
+
+
+def addVrayAttributeGroupDeferred(nodes, group, values=None, budget=0.05, on_finish=None):
+    """ Add a V-ray attribute group to many nodes in chunks while Maya is idle, see `deferredJob.DeferredJob`.
+
+    The UI stays responsive, the progress is shown in the progress window and pressing Escape cancels the
+    job: the group is removed again from the nodes it was added to and overwritten values are restored.
+
+    :param nodes: The nodes to add the attribute group to.
+    :type  nodes: list of str
+
+    :param group: The attribute group, eg. "vray_subdivision" or "vray_objectID".
+    :type  group: str
+
+    :param values: Attribute values to set on all nodes after the group is added, eg. {"vrayObjectID": 5}.
+    :type  values: dict or None
+
+    :param budget: The time in seconds each chunk should take.
+    :type  budget: float
+
+    :param on_finish: Called with the job when it's done or cancelled.
+    :type  on_finish: callable or None
+
+    :rtype: deferredJob.DeferredJob
+    :return: The started job.
+    """
+    from deferredJob import DeferredJob
+    values = values or {}
+
+    def apply(chunk):
+        snapshot = snapshotValues(chunk, sorted(values)) if values else []
+        added = []
+        addVrayAttributeGroup(chunk, group, values, added=added)
+        return added, snapshot
+
+    def rollback(chunk, result):
+        added, snapshot = result
+        removeVrayAttributeGroup(added, group)
+        restoreValues(snapshot)
+
+    job = DeferredJob(uniqueNodes(nodes), apply, rollback, budget=budget,
+                      title="Adding {0}".format(group), on_finish=on_finish)
+    return job.start()
@@ -0,0 +1,251 @@
+import maya.cmds as mc
+import maya.api.OpenMaya as om
+
+from vrayCatalog import loadCatalog
+
+
+# The index is built once per scene and kept current by a few global Maya callbacks (no callbacks per node):
+#   groups  - attribute group -> uuids of the nodes that have it
+#   pending - uuids of new or changed nodes, they are checked on the next lookup with a few batched calls
+# Groups added or removed by the snippets are recorded by them (`groupAdded`, `markChanged`), an undo or redo
+# throws the index away. Groups removed by other tools aren't seen, so before acting on specific nodes the
+# snippets check them with `checkGroup` (one batched `ls`). Attribute values aren't cached, `groupValues` reads
+# them through the API without command calls.
+_index = {"groups": None, "pending": set()}
+_callbacks = []
+
+
+def invalidate(*args):
+    """ Throw away the V-ray attribute index, it's rebuilt on the next lookup. """
+    _index["groups"] = None
+    _index["pending"].clear()
+
+
+def _uuid(obj):
+    return om.MFnDependencyNode(obj).uuid().asString()
+
+
+def _onNodeAdded(node, client_data=None):
+    # Duplicated, imported or pasted nodes can come with V-ray attributes
+    if _index["groups"] is not None:
+        _index["pending"].add(_uuid(node))
+
+
+def _onNodeRemoved(node, client_data=None):
+    if _index["groups"] is None:
+        return
+    uuid = _uuid(node)
+    for uuids in _index["groups"].values():
+        uuids.discard(uuid)
+    _index["pending"].discard(uuid)
+
+
+def _installCallbacks():
+    if _callbacks:
+        return
+    _callbacks.append(om.MDGMessage.addNodeAddedCallback(_onNodeAdded))
+    _callbacks.append(om.MDGMessage.addNodeRemovedCallback(_onNodeRemoved))
+    # Invalidated before an open or new too, so the nodes of the next scene aren't all collected as pending
+    for message in (om.MSceneMessage.kBeforeOpen, om.MSceneMessage.kBeforeNew, om.MSceneMessage.kAfterOpen,
+                    om.MSceneMessage.kAfterNew, om.MSceneMessage.kAfterImport,
+                    om.MSceneMessage.kAfterLoadReference, om.MSceneMessage.kAfterUnloadReference):
+        _callbacks.append(om.MSceneMessage.addCallback(message, invalidate))
+    for event in ("Undo", "Redo"):
+        _callbacks.append(om.MEventMessage.addEventCallback(event, invalidate))
+
+
+def uninstall():
+    """ Remove the Maya callbacks of the index and clear it. """
+    for callback in _callbacks:
+        om.MMessage.removeCallback(callback)
+    del _callbacks[:]
+    invalidate()
+
+
+def _markers():
+    """ Per attribute group an attribute it creates, to find the nodes that have the group. """
+    catalog = loadCatalog()
+    return dict((group, info["attributes"][0]) for group, info in catalog["groups"].items() if info["attributes"])
+
+
+def _scan(nodes=None):
+    """ Return per group the uuids of the nodes (of `nodes`, or the whole scene) that have it. """
+    found = {}
+    for group, marker in _markers().items():
+        if nodes is None:
+            # recursive: the nodes in (nested) namespaces too
+            plugs = mc.ls("*.{0}".format(marker), recursive=True, long=True) or []
+        else:
+            plugs = mc.ls(["{0}.{1}".format(node, marker) for node in nodes], long=True) or []
+        names = [plug.rsplit(".", 1)[0] for plug in plugs]
+        found[group] = (mc.ls(names, uuid=True) or []) if names else []
+    return found
+
+
+def _update():
+    """ Build the index or check the pending nodes, with a few batched calls per attribute group. """
+    if _index["groups"] is None:
+        _index["pending"].clear()
+        groups = {}
+        for group, uuids in _scan().items():
+            groups[group] = set(uuids)
+        _index["groups"] = groups
+        _installCallbacks()
+        return
+
+    if not _index["pending"]:
+        return
+    pending = _index["pending"]
+    _index["pending"] = set()
+    names = mc.ls(list(pending), long=True) or []
+    found = _scan(names) if names else {}
+    for group, uuids in _index["groups"].items():
+        uuids.difference_update(pending)
+        uuids.update(found.get(group, ()))
+
+
+def checkGroup(group, nodes):
+    """ Return which of the nodes have the attribute group, checked in the scene with one batched `ls` of an
+    attribute it creates, and correct the index with what was found.
+
+    Use it before acting on what the index says about specific nodes: a group removed by another tool (or the
+    Attribute Editor) isn't seen by the index until then.
+
+    :param nodes: (long name, uuid) pairs.
+    :type  nodes: list of tuple
+
+    :rtype: set of str
+    :return: The uuids of the nodes that have the group.
+    """
+    marker = _markers().get(group)
+    if marker is None or not nodes:
+        return set()
+    uuids = dict(nodes)
+    plugs = mc.ls(["{0}.{1}".format(path, marker) for path, uuid in nodes], long=True) or []
+    found = set(uuids[plug.rsplit(".", 1)[0]] for plug in plugs if plug.rsplit(".", 1)[0] in uuids)
+    if _index["groups"] is not None:
+        indexed = _index["groups"].setdefault(group, set())
+        indexed.difference_update(set(uuids.values()) - found)
+        indexed.update(found)
+    return found
+
+
+def groupAdded(group, nodes):
+    """ Record that the group was added to the nodes, so they don't have to be checked again.
+
+    Only the nodes that really got the group are recorded, see `checkGroup`.
+
+    :param nodes: (long name, uuid) pairs.
+    :type  nodes: list of tuple
+    """
+    if _index["groups"] is None or not nodes:
+        return
+    if group not in _markers():
+        # Not in the catalog, let the next lookup check the nodes
+        _index["pending"].update(uuid for path, uuid in nodes)
+        return
+    checkGroup(group, nodes)
+
+
+def markChanged(uuids):
+    """ Let the index check these nodes again on the next lookup, for groups added or removed by other tools. """
+    if _index["groups"] is not None:
+        _index["pending"].update(uuids)
+
+
+def groupIndex():
+    """ Return the (cached) index of the current scene: per V-ray attribute group the uuids of its nodes.
+
+    :rtype: dict
+    """
+    _update()
+    return _index["groups"]
+
+
+def nodesWithGroup(group):
+    """ Return the long names of all nodes in the scene that have the attribute group.
+
+    :rtype: list of str
+    """
+    uuids = groupIndex().get(group)
+    if not uuids:
+        return []
+    return mc.ls(list(uuids), long=True) or []
+
+
+def uuidsWithGroup(group):
+    """ Return the uuids of all nodes in the scene that have the attribute group, without any command calls
+    once the index is built (and nothing changed).
+
+    :rtype: set of str
+    """
+    return set(groupIndex().get(group, ()))
+
+
+def nodesWithoutGroup(nodes, group):
+    """ Return the nodes that lack the attribute group, eg. which shapes lack vray_subdivision:
+
+        nodesWithoutGroup(mc.ls(type="mesh", long=True), "vray_subdivision")
+
+    :param nodes: The nodes to check.
+    :type  nodes: list of str
+
+    :rtype: list of str
+    """
+    if not nodes:
+        return []
+    uuids = mc.ls(nodes, uuid=True) or []
+    if len(uuids) != len(nodes):
+        uuids = [mc.ls(node, uuid=True)[0] for node in nodes]
+    has_group = groupIndex().get(group, set())
+    return [node for node, uuid in zip(nodes, uuids) if uuid not in has_group]
+
+
+def groupValue(node, attr):
+    """ Return the current value of a V-ray attribute, values aren't cached (see the index above).
+
+    :rtype: object
+    """
+    return mc.getAttr("{0}.{1}".format(node, attr))
+
+
+def _plugValue(plug):
+    """ Return the value of a plug the way `getAttr` does, compounds (like colors) as [(r, g, b)]. """
+    if plug.isCompound:
+        return [tuple(_plugValue(plug.child(index)) for index in range(plug.numChildren()))]
+    attr = plug.attribute()
+    if attr.hasFn(om.MFn.kNumericAttribute):
+        numeric_type = om.MFnNumericAttribute(attr).numericType()
+        if numeric_type == om.MFnNumericData.kBoolean:
+            return plug.asBool()
+        if numeric_type in (om.MFnNumericData.kFloat, om.MFnNumericData.kDouble):
+            return plug.asDouble()
+        return plug.asInt()
+    if attr.hasFn(om.MFn.kEnumAttribute):
+        return plug.asShort()
+    if attr.hasFn(om.MFn.kTypedAttribute) and om.MFnTypedAttribute(attr).attrType() == om.MFnData.kString:
+        return plug.asString()
+    # Anything else (eg. distances, which getAttr returns in the UI unit) goes through the command
+    return mc.getAttr(plug.name())
+
+
+def groupValues(nodes, attrs):
+    """ Return per node the current values of the attributes, read through the API without a command call
+    per plug (unlike `groupValue`).
+
+    :param nodes: The long names of the nodes.
+    :type  nodes: list of str
+
+    :param attrs: The attributes to read of each node, they must exist.
+    :type  attrs: list of str
+
+    :rtype: list of list
+    :return: Per node the values in the order of `attrs`, like `getAttr` returns them.
+    """
+    values = []
+    for node in nodes:
+        selection = om.MSelectionList()
+        selection.add(node)
+        fn = om.MFnDependencyNode(selection.getDependNode(0))
+        values.append([_plugValue(fn.findPlug(attr, False)) for attr in attrs])
+    return values
@@ -0,0 +1,156 @@
+import maya.cmds as mc
+import fnmatch
+import re
+import time
+
+from vrayAttributeGroups import addVrayAttributeGroup
+
+
+class AttributeRule(object):
+    """ A naming convention: add an attribute group to the shapes of the transforms matching a name pattern.
+
+    :param pattern: A wildcard pattern matched against the short name of transforms, eg. "*_SMOOTH".
+    :type  pattern: str
+
+    :param node_type: The type of the children shapes to add the group to, eg. "mesh".
+                      Use "transform" to add the group to the matching transforms themselves.
+    :type  node_type: str
+
+    :param group: The attribute group to add, eg. "vray_subdivision".
+    :type  group: str
+
+    :param values: Attribute values to set after the group is added, eg. {"vrayObjectID": 5}.
+    :type  values: dict or None
+    """
+    __slots__ = ("pattern", "node_type", "group", "values", "_regex")
+
+    def __init__(self, pattern, node_type, group, values=None):
+        self.pattern = pattern
+        self.node_type = node_type
+        self.group = group
+        self.values = values or {}
+        self._regex = re.compile(fnmatch.translate(pattern))
+
+    def matches(self, name):
+        return self._regex.match(name) is not None
+
+    def __repr__(self):
+        return "AttributeRule({0!r}, {1!r}, {2!r}, {3!r})".format(self.pattern, self.node_type, self.group,
+                                                                  self.values)
+
+
+# The naming conventions of tutorial 02
+DEFAULT_RULES = [
+    AttributeRule("*_SMOOTH", "mesh", "vray_subdivision"),
+    AttributeRule("*_EXTREMELY_RENDERABLE_CURVE", "nurbsCurve", "vray_nurbscurve_renderable"),
+]
+
+
+def _asRule(rule):
+    return rule if isinstance(rule, AttributeRule) else AttributeRule(*rule)
+
+
+def _listScene(node_types):
+    """ List the transforms and shapes of the given types in the scene with a single command call.
+
+    All instance paths are listed (`ls` otherwise gives one path per node), so an instanced shape shows up
+    under each of its parents and a rule matching any of the parent names picks it up.
+
+    :rtype: (list, dict)
+    :return: The long names of the transforms and a mapping of each transform to its (shape, type) children.
+    """
+    listed = mc.ls(type=sorted(set(node_types) | set(["transform"])), dag=True, allPaths=True, long=True,
+                   noIntermediate=True, showType=True) or []
+
+    transforms = []
+    children = {}
+    for index in range(0, len(listed), 2):
+        path, node_type = listed[index], listed[index + 1]
+        if node_type == "transform":
+            transforms.append(path)
+        else:
+            children.setdefault(path.rsplit("|", 1)[0], []).append((path, node_type))
+    return transforms, children
+
+
+def applyAttributeRules(rules=None, verbose=True):
+    """ Apply a table of naming convention rules to the whole scene in one traversal.
+
+    The scene is listed once for all rules together (instead of an `ls` per pattern), every transform is
+    matched against all patterns and the nodes are then collected per attribute group and values so each
+    group is added with one batched `addVrayAttributeGroup` call. An instanced shape is processed once, even
+    if the names of several of its parents match.
+
+        applyAttributeRules([("*_SMOOTH", "mesh", "vray_subdivision", None),
+                             ("*_ID5", "mesh", "vray_objectID", {"vrayObjectID": 5})])
+
+    :param rules: The rules as `AttributeRule` or (pattern, node type, group, values) tuples.
+                  Defaults to `DEFAULT_RULES`.
+    :type  rules: list
+
+    :param verbose: If True print the matches of each rule and the timing.
+    :type  verbose: bool
+
+    :rtype: list of dict
+    :return: Per rule the "rule", the amount of "transforms" and "nodes" it matched (as instance paths), the
+             "seconds" of the batched attribute group call and its counts ("added", "skipped", "set"), which
+             are shared by the rules with the same group and values.
+    """
+    rules = [_asRule(rule) for rule in (DEFAULT_RULES if rules is None else rules)]
+    if not rules:
+        return []
+
+    start_time = time.time()
+    transforms, children = _listScene([rule.node_type for rule in rules])
+    list_time = time.time() - start_time
+    match_start = time.time()
+
+    # Quickly skip the transforms that don't match any of the patterns
+    any_rule = re.compile("|".join("(?:{0})".format(fnmatch.translate(rule.pattern)) for rule in rules))
+
+    results = [{"rule": rule, "transforms": 0, "nodes": 0, "seconds": 0.0} for rule in rules]
+    nodes = [[] for rule in rules]
+    for path in transforms:
+        name = path.rsplit("|", 1)[-1]
+        if not any_rule.match(name):
+            continue
+
+        for rule, result, rule_nodes in zip(rules, results, nodes):
+            if rule.matches(name):
+                result["transforms"] += 1
+                if rule.node_type == "transform":
+                    rule_nodes.append(path)
+                else:
+                    rule_nodes.extend(shape for shape, node_type in children.get(path, ())
+                                      if node_type == rule.node_type)
+    match_time = time.time() - match_start
+
+    # Rules that add the same group with the same values share one batched call
+    batches = {}
+    for rule, result, rule_nodes in zip(rules, results, nodes):
+        result["nodes"] = len(rule_nodes)
+        key = (rule.group, tuple(sorted(rule.values.items())))
+        batches.setdefault(key, ([], []))
+        batches[key][0].extend(rule_nodes)
+        batches[key][1].append(result)
+
+    for (group, values), (batch_nodes, batch_results) in batches.items():
+        batch_start = time.time()
+        counts = addVrayAttributeGroup(batch_nodes, group, dict(values)) if batch_nodes else {}
+        batch_time = time.time() - batch_start
+        for result in batch_results:
+            result.update(counts)
+            result["seconds"] += batch_time / len(batch_results)
+
+    if verbose:
+        print "Listed {0} transforms in {1:.3f} seconds, matched them in {2:.3f} seconds".format(
+            len(transforms), list_time, match_time)
+        for result in results:
+            print "{0:<40} {1:>8} transforms {2:>8} nodes {3:>8.3f} seconds".format(
+                result["rule"].pattern, result["transforms"], result["nodes"], result["seconds"])
+
+    return results
+
+
+if __name__ == "__main__":
+    applyAttributeRules()
@@ -0,0 +1,280 @@
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+from vrayFrameBufferFixBatch import expandPaths
+
+
+# The state of a worker process: its Maya session is started once and reused for all its scenes. The "error"
+# of a failed start up (eg. no license) is kept, the scenes of the worker then fail with it
+_worker = {"startup": 0.0, "scenes": 0, "error": None}
+
+
+# Maya (and the snippets using it) is only imported within the worker processes, so the parent process
+# doesn't have to be mayapy
+def _geometryShapes():
+    import maya.cmds as mc
+    from shapeResolver import GEOMETRY_TYPES
+    return mc.ls(type=GEOMETRY_TYPES, noIntermediate=True, long=True) or []
+
+
+def _rules(options):
+    from vrayAttributeRules import applyAttributeRules
+    results = applyAttributeRules(verbose=False)
+    return "{0} nodes matched".format(sum(result["nodes"] for result in results))
+
+
+def _objectIds(options):
+    from vrayIdAllocator import assignObjectIds
+    shapes = _geometryShapes()
+    if not shapes:
+        return "no shapes"
+    result = assignObjectIds(shapes, by=options["object_ids_by"], undo=options["undo"], verbose=False)
+    return "{0} ids on {1} shapes".format(len(result["ids"]), len(shapes))
+
+
+def _subdivision(options):
+    from addVraySubdivisionAttributes import addVraySubdivisionAttribute
+    shapes = _geometryShapes()
+    if not shapes:
+        return "no shapes"
+    counts = addVraySubdivisionAttribute(shapes, undo=options["undo"])
+    return "{0} added, {1} skipped".format(counts["added"], counts["skipped"])
+
+
+def _materialIds(options):
+    import maya.cmds as mc
+    from vrayIdAllocator import assignMaterialIds
+    materials = mc.ls(mat=1) or []
+    if not materials:
+        return "no materials"
+    result = assignMaterialIds(materials, undo=options["undo"], verbose=False)
+    return "{0} ids on {1} materials".format(len(result["ids"]), len(materials))
+
+
+def _frameBuffer(options):
+    import maya.cmds as mc
+    from vrayFrameBufferFix import vrayFrameBufferFixInMemory
+    if not mc.objExists("vraySettings"):
+        return "no vraySettings"
+    if not vrayFrameBufferFixInMemory():
+        raise RuntimeError("The frame buffer settings can't be reset in memory")
+    return "reset"
+
+
+def _compactSettings(options):
+    from vraySettingsAudit import compactSettings
+    compacted = compactSettings(verbose=False)
+    return ", ".join("{0} from {1} elements".format(attr, size) for attr, size in compacted) or "nothing to compact"
+
+
+# The operations a worker can run on each scene
+OPERATIONS = {"rules": _rules, "objectIds": _objectIds, "subdivision": _subdivision, "materialIds": _materialIds,
+              "frameBuffer": _frameBuffer, "compactSettings": _compactSettings}
+OPERATION_NAMES = ("rules", "objectIds", "subdivision", "materialIds", "frameBuffer", "compactSettings")
+# objectIds and materialIds reassign every ID in the scene (overwriting IDs set by hand), they only run when asked
+DEFAULT_OPERATIONS = ("subdivision", "frameBuffer")
+
+
+def _initWorker():
+    """ Pool initializer: start the headless Maya session of this worker process, once.
+
+    It never raises: the pool would start a new worker for each one that dies, forever. A failure is kept in
+    the worker state instead and reported for each of its scenes by `_runScene`.
+    """
+    start_time = time.time()
+    _worker["scenes"] = 0
+    _worker["error"] = None
+    try:
+        import maya.standalone
+        maya.standalone.initialize(name="python")
+        import maya.cmds as mc
+        if not mc.pluginInfo("vrayformaya", query=True, loaded=True):
+            mc.loadPlugin("vrayformaya", quiet=True)
+        # Nobody undoes in a batch, with undo disabled the operations don't fill (and keep) an undo queue
+        mc.undoInfo(state=False)
+    except Exception as exc:
+        _worker["error"] = "{0}: {1}".format(type(exc).__name__, exc)
+    _worker["startup"] = time.time() - start_time
+
+
+def _runScene(args):
+    """ Pool worker: open a scene, run the operations and save it.
+
+    A scene is only saved when all operations succeeded.
+
+    :rtype: dict
+    :return: The scene "path", its "status" ("done" or "error"), the "seconds" per step (open, the operations
+             and save), the "results" of the operations, the "error" message, the "worker" process id and
+             the "startup" seconds of the worker if this was its first scene (else 0).
+    """
+    path, operations, options = args
+    result = {"path": path, "status": "done", "seconds": {}, "results": {}, "error": None, "worker": os.getpid(),
+              "startup": _worker["startup"] if not _worker["scenes"] else 0.0}
+    _worker["scenes"] += 1
+    if _worker["error"]:
+        # The Maya session of this worker didn't start, don't touch the scene
+        result["status"] = "error"
+        result["error"] = "start up: {0}".format(_worker["error"])
+        result["total"] = 0.0
+        return result
+
+    import maya.cmds as mc
+    from undoPolicies import UNDO_NODE
+    options = dict(options, undo=UNDO_NODE)
+    start_time = time.time()
+    step = "open"
+    try:
+        mc.file(path, open=True, force=True)
+        result["seconds"]["open"] = time.time() - start_time
+        for step in operations:
+            step_time = time.time()
+            result["results"][step] = OPERATIONS[step](options)
+            result["seconds"][step] = time.time() - step_time
+        if not options["dry_run"]:
+            step = "save"
+            step_time = time.time()
+            mc.file(save=True, force=True)
+            result["seconds"]["save"] = time.time() - step_time
+    except Exception as exc:
+        result["status"] = "error"
+        result["error"] = "{0}: {1}".format(step, exc)
+    finally:
+        # Free the scene before the worker picks up its next one
+        try:
+            mc.file(new=True, force=True)
+        except RuntimeError:
+            pass
+    result["total"] = time.time() - start_time
+    return result
+
+
+def vrayBatchRunner(paths, operations=DEFAULT_OPERATIONS, processes=None, scenes_per_worker=None, dry_run=False,
+                    object_ids_by="asset", verbose=True):
+    """ Run V-ray snippets on many scenes with a pool of headless Maya (mayapy) sessions.
+
+    Each worker process starts Maya once and then opens, processes and saves scene after scene, so the start
+    up cost is paid once per worker instead of once per scene. Run it with mayapy:
+
+        mayapy vrayBatchRunner.py -j 4 "/path/to/scenes/*.mb"
+
+    :param paths: Paths or glob patterns of the scenes.
+    :type  paths: list of str
+
+    :param operations: The `OPERATION_NAMES` to run on each scene, in this order.
+    :type  operations: list of str
+
+    :param processes: The amount of worker processes. None uses the amount of CPUs.
+    :type  processes: int or None
+
+    :param scenes_per_worker: Restart a worker after this many scenes (to return memory that Maya leaks
+                              between scenes). None keeps the workers alive for the whole batch.
+    :type  scenes_per_worker: int or None
+
+    :param dry_run: If True run the operations but don't save the scenes.
+    :type  dry_run: bool
+
+    :param object_ids_by: How the shapes are grouped to share an object ID, see `vrayIdAllocator.groupNodes`.
+    :type  object_ids_by: str
+
+    :param verbose: If True print the result of each scene when it's done.
+    :type  verbose: bool
+
+    :rtype: list of dict
+    :return: Per scene the result of `_runScene`, in the order they finished.
+    """
+    unknown = [name for name in operations if name not in OPERATION_NAMES]
+    if unknown:
+        raise ValueError("Unknown operations: {0}, use any of {1}".format(", ".join(unknown),
+                                                                          ", ".join(OPERATION_NAMES)))
+    files = expandPaths(paths)
+    if not files:
+        return []
+
+    options = {"dry_run": dry_run, "object_ids_by": object_ids_by}
+    tasks = [(path, list(operations), options) for path in files]
+    processes = min(processes or multiprocessing.cpu_count(), len(files))
+    results = []
+    pool = multiprocessing.Pool(processes, initializer=_initWorker, maxtasksperchild=scenes_per_worker)
+    try:
+        for result in pool.imap_unordered(_runScene, tasks):
+            results.append(result)
+            if not verbose:
+                continue
+            if result["status"] == "error":
+                print "{0}: ERROR {1}".format(result["path"], result["error"])
+            else:
+                print "{0}: {1} ({2:.2f} seconds)".format(
+                    result["path"], ", ".join("{0} {1}".format(name, result["results"][name]) for name in operations),
+                    result["total"])
+    finally:
+        pool.close()
+        pool.join()
+
+    return results
+
+
+def summarize(results, operations):
+    """ Return the totals of a batch: per step (open, operations and save) the "count", "total" and "max"
+    seconds, the worker "startup" seconds and the amount of "workers", and the "failures" as (path, error).
+
+    :rtype: dict
+    """
+    steps = {}
+    for result in results:
+        for step, seconds in result["seconds"].items():
+            totals = steps.setdefault(step, {"count": 0, "total": 0.0, "max": 0.0})
+            totals["count"] += 1
+            totals["total"] += seconds
+            totals["max"] = max(totals["max"], seconds)
+    return {"scenes": len(results),
+            "steps": [(step, steps[step]) for step in ["open"] + list(operations) + ["save"] if step in steps],
+            "workers": len(set(result["worker"] for result in results)),
+            "startup": sum(result["startup"] for result in results),
+            "failures": [(result["path"], result["error"]) for result in results if result["status"] == "error"]}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run V-ray snippets on many Maya scenes with a pool of headless "
+                                                 "Maya sessions. Run it with mayapy.")
+    parser.add_argument("paths", nargs="+", help="Paths or glob patterns of the scenes")
+    parser.add_argument("-o", "--operations", nargs="+", default=list(DEFAULT_OPERATIONS), choices=OPERATION_NAMES,
+                        help="The operations to run on each scene, in this order (defaults to {0}). objectIds and "
+                             "materialIds reassign all IDs in the scene".format(" ".join(DEFAULT_OPERATIONS)))
+    parser.add_argument("-j", "--processes", type=int, default=None,
+                        help="Amount of worker processes (defaults to the amount of CPUs)")
+    parser.add_argument("--scenes-per-worker", type=int, default=None,
+                        help="Restart a worker after this many scenes (defaults to never)")
+    parser.add_argument("--object-ids-by", default="asset", help="How shapes are grouped to share an object ID")
+    parser.add_argument("-n", "--dry-run", action="store_true", help="Don't save the scenes")
+    parser.add_argument("--summary", help="Also write the per scene results and the summary to this json file")
+    args = parser.parse_args(argv)
+
+    start_time = time.time()
+    results = vrayBatchRunner(args.paths, operations=args.operations, processes=args.processes,
+                              scenes_per_worker=args.scenes_per_worker, dry_run=args.dry_run,
+                              object_ids_by=args.object_ids_by)
+    summary = summarize(results, args.operations)
+    duration = time.time() - start_time
+
+    for step, totals in summary["steps"]:
+        print "{0:<12} {1:>5} scenes {2:>9.2f}s total {3:>7.2f}s mean {4:>7.2f}s max".format(
+            step, totals["count"], totals["total"], totals["total"] / totals["count"], totals["max"])
+    print "{0} scenes, {1} failed in {2:.2f} seconds ({3} workers, {4:.2f} seconds start up)".format(
+        summary["scenes"], len(summary["failures"]), duration, summary["workers"], summary["startup"])
+    for path, error in summary["failures"]:
+        print "  {0}: {1}".format(path, error)
+
+    if args.summary:
+        summary["seconds"] = duration
+        with open(args.summary, "w") as f:
+            json.dump({"summary": summary, "scenes": results}, f, indent=1)
+
+    return 1 if summary["failures"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
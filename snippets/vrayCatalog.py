@@ -0,0 +1,205 @@
+import maya.cmds as mc
+import json
+import os
+
+
+# The attribute groups that are looked up when the catalog is built, others are added when they're first used
+KNOWN_GROUPS = ("vray_subdivision", "vray_subquality", "vray_displacement", "vray_opensubdiv", "vray_roundedges",
+                "vray_user_attributes", "vray_objectID", "vray_material_id", "vray_nurbscurve_renderable",
+                "vray_skip_export")
+
+# The node types each group is tried on
+PROBE_TYPES = ("mesh", "nurbsSurface", "nurbsCurve", "transform", "VRayMtl", "lambert", "blinn", "phong")
+
+# Bump when the layout of the catalog file changes
+CATALOG_FORMAT = 2
+
+# The catalog of this session, it's loaded once
+_catalog = {}
+# The groups that turned out not to be V-ray attribute groups (eg. a typo), they're only kept for the session
+_unknown = {}
+
+
+def vrayVersion():
+    """ Return the version of the loaded V-ray for Maya plug-in. """
+    return mc.pluginInfo("vrayformaya", query=True, version=True)
+
+
+def catalogPath(version):
+    """ Return the path of the catalog file of a V-ray version.
+
+    The catalogs are stored in the directory of the `VRAY_SNIPPETS_CATALOG_DIR` environment variable or in the
+    Maya user application directory.
+    """
+    directory = os.environ.get("VRAY_SNIPPETS_CATALOG_DIR") or os.path.join(mc.internalVar(userAppDir=True),
+                                                                             "vrayCatalog")
+    return os.path.join(directory, "vrayCatalog_{0}.json".format(version.replace(" ", "_")))
+
+
+def _probeGroup(group, node_types):
+    """ Add the group to a temporary node of each type and see what attributes it creates. """
+    result = {"nodeTypes": [], "attributes": [], "defaults": {}}
+    for node_type in node_types:
+        try:
+            node = mc.createNode(node_type, skipSelect=True)
+        except RuntimeError:
+            # The node type doesn't exist (in this version or without its plug-in)
+            continue
+        try:
+            before = set(mc.listAttr(node) or [])
+            try:
+                mc.vray("addAttributesFromGroup", node, group, 1)
+            except RuntimeError:
+                continue
+            created = [attr for attr in mc.listAttr(node) or [] if attr not in before]
+            if created:
+                result["nodeTypes"].append(node_type)
+                result["attributes"] = sorted(set(result["attributes"]).union(created))
+                for attr in created:
+                    if attr not in result["defaults"]:
+                        result["defaults"][attr] = mc.getAttr("{0}.{1}".format(node, attr))
+        finally:
+            mc.delete(mc.listRelatives(node, parent=True, fullPath=True) or node)
+    return result
+
+
+def _index(catalog):
+    node_types = {}
+    for group, info in sorted(catalog["groups"].items()):
+        for node_type in info["nodeTypes"]:
+            node_types.setdefault(node_type, []).append(group)
+    catalog["nodeTypes"] = node_types
+    return catalog
+
+
+def introspect(groups=KNOWN_GROUPS, node_types=PROBE_TYPES, version=None):
+    """ Build a catalog by adding each group to temporary nodes of each type (without undo).
+
+    :rtype: dict
+    :return: The catalog with the V-ray "version", per group its "nodeTypes", "attributes" and their
+             "defaults" and per node type its groups ("nodeTypes" index).
+    """
+    state = mc.undoInfo(query=True, stateWithoutFlush=True)
+    mc.undoInfo(stateWithoutFlush=False)
+    try:
+        groups = dict((group, _probeGroup(group, node_types)) for group in groups)
+    finally:
+        mc.undoInfo(stateWithoutFlush=state)
+    return _index({"format": CATALOG_FORMAT, "version": version or vrayVersion(), "probeTypes": list(node_types),
+                   "groups": groups})
+
+
+def _write(catalog, path):
+    """ Write the catalog file, a catalog that can't be written is only used for this session. """
+    # Only needed when the catalog is (re)built, importing the scene file engine costs every tool's start up
+    from maSceneFile import replaceFile
+    # Per process, batch workers can write the catalog at the same time
+    temp_path = "{0}.{1}.tmp".format(path, os.getpid())
+    try:
+        directory = os.path.dirname(path)
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        with open(temp_path, "w") as f:
+            json.dump(catalog, f, indent=1, sort_keys=True)
+        replaceFile(temp_path, path)
+    except (IOError, OSError) as exc:
+        print "Couldn't write the V-ray catalog {0}: {1}".format(path, exc)
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def loadCatalog(refresh=False):
+    """ Return the catalog of the loaded V-ray version, built once per version and cached on disk.
+
+    Only the first call of a session runs commands (the plug-in version and reading the file), the catalog
+    is then kept in memory.
+
+    :param refresh: If True the catalog is introspected again and written to disk.
+    :type  refresh: bool
+
+    :rtype: dict
+    """
+    if _catalog and not refresh:
+        return _catalog
+
+    version = vrayVersion()
+    path = catalogPath(version)
+    catalog = None
+    if not refresh and os.path.exists(path):
+        try:
+            with open(path) as f:
+                catalog = json.load(f)
+        except ValueError:
+            catalog = None
+        if catalog and catalog.get("format") != CATALOG_FORMAT:
+            catalog = None
+
+    if catalog is None:
+        catalog = introspect(version=version)
+        _write(catalog, path)
+
+    _catalog.clear()
+    _catalog.update(catalog)
+    _unknown.clear()
+    _catalog["path"] = path
+    return _catalog
+
+
+def groupInfo(group):
+    """ Return the "nodeTypes", "attributes" and "defaults" of an attribute group.
+
+    Groups that aren't in the catalog yet are introspected once and added to it. Groups that can't be added to
+    any node type aren't written to the catalog file.
+
+    :rtype: dict
+    """
+    catalog = loadCatalog()
+    info = catalog["groups"].get(group) or _unknown.get(group)
+    if info is None:
+        info = introspect([group], catalog["probeTypes"], catalog["version"])["groups"][group]
+        if not info["nodeTypes"]:
+            _unknown[group] = info
+            return info
+        catalog["groups"][group] = info
+        _index(catalog)
+        _write(dict((key, value) for key, value in catalog.items() if key != "path"), catalog["path"])
+    return info
+
+
+def groupDefaults(group):
+    """ Return the values the attributes of an attribute group have right after it's added.
+
+    :rtype: dict
+    """
+    return dict(groupInfo(group)["defaults"])
+
+
+def groupsForNodeType(node_type):
+    """ Return the attribute groups that can be added to a node type.
+
+    :rtype: list of str
+    """
+    return list(loadCatalog()["nodeTypes"].get(node_type, []))
+
+
+def groupAttributes(group):
+    """ Return the attributes an attribute group creates.
+
+    :rtype: list of str
+    """
+    return list(groupInfo(group)["attributes"])
+
+
+def supportedTypes(group, node_types):
+    """ Return the node types (of `node_types`) the attribute group can be added to.
+
+    :raises ValueError: If the group can't be added to any of the node types.
+
+    :rtype: list of str
+    """
+    valid = groupInfo(group)["nodeTypes"]
+    supported = [node_type for node_type in node_types if node_type in valid]
+    if not supported:
+        raise ValueError("The V-ray attribute group '{0}' can't be added to: {1}".format(group,
+                                                                                         ", ".join(node_types)))
+    return supported
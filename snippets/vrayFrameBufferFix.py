@@ -1,21 +1,193 @@
 import maya.cmds as mc
 import os
+import shutil
+import tempfile
+import time
+
+try:
+    from maSceneFile import removeVfbSA
+except ImportError:
+    # This snippet pasted into the script editor on its own: a streaming remover that strips the same setAttr
+    # ".vfbSA" statements as `maSceneFile.removeVfbSA` (of an uncompressed .ma file) and reports the same way.
+    import re
+
+    # A setAttr of .vfbSA, whatever flags come before the attribute
+    _VFBSA_HEAD = re.compile(br'\s*setAttr(?:\s+-\w+(?:\s+"[^"]*"|\s+[^\s";-][^\s";]*)?)*\s+"\.vfbSA"')
+    _NON_SPACE = re.compile(br"\S")
+    _QUOTE_OR_END = re.compile(br'[";]')
+    _QUOTE_OR_ESCAPE = re.compile(br'["\\]')
+    _START, _HEAD, _PASS, _SKIP, _COMMENT = range(5)
+    # The bytes of a statement that decide whether it's stripped, the rest of it is never held in memory
+    _HEADER_SIZE = 4096
+
+    def _statementEnd(data, pos, state):
+        """ Return the index right after the ";" ending the statement or -1, `state` is [in_string, escape]. """
+        in_string, escape = state
+        while pos < len(data):
+            if escape:
+                pos += 1
+                escape = False
+            elif in_string:
+                match = _QUOTE_OR_ESCAPE.search(data, pos)
+                if match is None:
+                    break
+                pos = match.end()
+                escape = data[pos - 1:pos] == b"\\"
+                in_string = escape
+            else:
+                match = _QUOTE_OR_END.search(data, pos)
+                if match is None:
+                    break
+                pos = match.end()
+                if data[pos - 1:pos] == b";":
+                    state[:] = [False, False]
+                    return pos
+                in_string = True
+        state[:] = [in_string, escape]
+        return -1
+
+    def _stripVfbSA(fin, fout, size):
+        """ Copy the statements of `fin` to `fout` except for the .vfbSA ones, return (bytes, removed, statements). """
+        total = removed = statements = 0
+        mode = _START
+        state = [False, False]
+        head = b""
+        for piece in iter(lambda: fin.readline(size), b""):
+            total += len(piece)
+            pos = 0
+            while pos < len(piece):
+                if mode == _START:
+                    # The leading whitespace belongs to the statement, like in the rule engine
+                    match = _NON_SPACE.search(piece, pos)
+                    if match is None:
+                        head += piece[pos:]
+                        break
+                    if piece.startswith(b"//", match.start()):
+                        fout.write(head)
+                        head = b""
+                        mode = _COMMENT
+                    else:
+                        mode = _HEAD
+                if mode == _COMMENT:
+                    eol = piece.find(b"\n", pos)
+                    end = len(piece) if eol == -1 else eol + 1
+                    fout.write(piece[pos:end])
+                    pos = end
+                    if eol != -1:
+                        mode = _START
+                    continue
+
+                end = _statementEnd(piece, pos, state)
+                text = piece[pos:len(piece) if end == -1 else end]
+                if mode == _HEAD:
+                    head += text
+                    if end != -1 or len(head) >= _HEADER_SIZE:
+                        if _VFBSA_HEAD.match(head):
+                            removed += len(head)
+                            statements += 1
+                            mode = _SKIP
+                        else:
+                            fout.write(head)
+                            mode = _PASS
+                        head = b""
+                elif mode == _PASS:
+                    fout.write(text)
+                else:
+                    removed += len(text)
+                if end == -1:
+                    break
+                pos = end
+                mode = _START
+        fout.write(head)
+        return total, removed, statements
+
+    def removeVfbSA(path, chunk_size=8 * 1024 * 1024, dry_run=False, verbose=True):
+        start_time = time.time()
+        fd, tmp_path = tempfile.mkstemp(suffix=".tmp", prefix=".maSceneFile_",
+                                        dir=os.path.dirname(os.path.abspath(path)))
+        try:
+            with open(path, "rb") as fin:
+                with os.fdopen(fd, "wb") as fout:
+                    # Lines are read in pieces of at most `chunk_size`, a huge array is never held completely
+                    total, removed, statements = _stripVfbSA(fin, fout, max(chunk_size, 1024))
+            if removed and not dry_run:
+                shutil.copymode(path, tmp_path)
+                try:
+                    os.rename(tmp_path, path)
+                except OSError:
+                    # Windows refuses to rename onto an existing file
+                    if os.name != "nt":
+                        raise
+                    os.remove(path)
+                    os.rename(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        if verbose:
+            duration = max(time.time() - start_time, 1e-6)
+            print "Removed {0} bytes in {1} statements from {2} ({3:.1f} MB at {4:.1f} MB/s)".format(
+                removed, statements, path, total / 1048576.0, total / 1048576.0 / duration)
+        return removed
+
+
+def vrayFrameBufferFixInMemory(settings="vraySettings"):
+    """ Resets the V-ray FrameBuffer settings directly on the vraySettings node in the open scene.
+
+    This clears the (corrupt) .vfbSA array on the node so no save and reopen of the scene is required.
+
+    :param settings: The name of the V-ray settings node.
+    :type  settings: str
+
+    :rtype: bool
+    :return: Whether the frame buffer settings could be reset in memory.
+             If False the file round trip of `vrayFrameBufferFix` is required.
+    """
+    if not mc.objExists(settings) or not mc.attributeQuery("vfbSA", node=settings, exists=True):
+        return False
+
+    plug = "{0}.vfbSA".format(settings)
+    if mc.getAttr(plug, lock=True) or mc.listConnections(plug, source=True, destination=False):
+        return False
+
+    try:
+        mc.setAttr(plug, [], type="Int32Array")
+    except RuntimeError:
+        return False
+
+    # Pop up the frame buffer again so the user can directly see whether it's back
+    try:
+        mc.vray("showVFB")
+    except RuntimeError:
+        pass
 
+    return True
 
-def vrayFrameBufferFix():
+
+def vrayFrameBufferFix(fast=True):
     """ Fixes missing V-ray FrameBuffer
 
         It happens from time to time that the V-ray frame buffer just disappears and won't pop up.
         In that scenario it's probably the good old V-ray for Maya framebuffer bug striking again.
         When that happens this script will come to the rescue.
 
-        It will save your file as a temporary .ma file, removes the buggy ASCII code of the
+        First it tries to reset the framebuffer settings on the vraySettings node in the open scene
+        (see `vrayFrameBufferFixInMemory`). Only if that isn't possible it will save your file as a temporary .ma file, removes the buggy ASCII code of the
         framebuffer, reopens the temp file and internally renames it to your original file.
 
         Note: It doesn't automatically save it over your original file even though it might
               look like it because it shows the original filename at the top.
               Save your scene when it worked. :)
+
+        :param fast: If True the in memory fix is tried first, otherwise it directly does the file round trip.
+        :type  fast: bool
     """
+    if fast:
+        start_time = time.time()
+        if vrayFrameBufferFixInMemory():
+            print "Fixed in memory! ({0:.2f} seconds)".format(time.time() - start_time)
+            return
+        print "Can't fix the framebuffer in memory, falling back to fixing it through a .ma file."
+
     current_dir = os.path.dirname(mc.file(query=True, sceneName=True))
     current_name, current_ext = os.path.splitext(mc.file(query=True, sceneName=True))
     fix_file_suffix = "_temp_vrayfb_fix.ma"
@@ -23,6 +195,8 @@ def vrayFrameBufferFix():
                                defaultButton='Yes', cancelButton='No', dismissString='No')
 
     if confirm == "Yes":
+        start_time = time.time()
+
         # Save file
         path_current_file = mc.file(force=True,save=1,options="v=0")
 
@@ -34,32 +208,7 @@ def vrayFrameBufferFix():
         path_fix_save = mc.file(force=True, save=1, options="v=0", type="mayaAscii")
 
         # Change .ma file
-        fin = open(path_fix_save, "r")
-        mafile = fin.readlines()
-        fin.close()
-        fixed_mafile = []
-
-        remove = 0
-        foundEOL = 0
-        for line in mafile:
-            if 'setAttr ".vfbSA"' in line:
-                remove = 1
-
-            if remove == 1:
-                if ';' in line:
-                    foundEOL = 1
-                if 'setAttr' in line and not 'setAttr ".vfbSA"' in line:
-                    remove = 0
-
-            if remove == 0:
-                fixed_mafile.append(line)
-
-            if foundEOL == 1:
-                remove = 0
-
-        fout = open(path_fix_save, "w")
-        fout.writelines(fixed_mafile)
-        fout.close()
+        removeVfbSA(path_fix_save)
         print path_fix_save
 
         # Open fixed file
@@ -69,7 +218,7 @@ def vrayFrameBufferFix():
         mc.file(rename=path_current_file)
 
         os.remove(path_fix_save)
-        print "Fixed!"
+        print "Fixed! ({0:.2f} seconds)".format(time.time() - start_time)
 
 
 if __name__ == "__main__":
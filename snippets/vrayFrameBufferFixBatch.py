@@ -0,0 +1,135 @@
+import argparse
+import glob
+import multiprocessing
+import os
+import sys
+import time
+
+from maFileCache import CLEAN, FIXED, FileStateCache
+from maSceneFile import containsVfbSA, removeVfbSA
+
+
+def expandPaths(patterns):
+    """ Expand the given paths and glob patterns to a sorted list of unique files.
+
+    Globs are expanded here because the Windows shell doesn't do it for us.
+    """
+    paths = set()
+    for pattern in patterns:
+        if glob.has_magic(pattern):
+            paths.update(os.path.abspath(path) for path in glob.glob(pattern) if os.path.isfile(path))
+        else:
+            # Explicit paths are always kept so a missing file gets reported as an error
+            paths.add(os.path.abspath(pattern))
+    return sorted(paths)
+
+
+def _fixFile(args):
+    """ Pool worker: fix a single .ma file.
+
+    :return: (path, status, bytes removed, seconds, error message)
+    :rtype: tuple
+    """
+    path, dry_run, skip_clean = args
+    start_time = time.time()
+    try:
+        if skip_clean and not containsVfbSA(path):
+            return path, "clean", 0, time.time() - start_time, None
+        removed = removeVfbSA(path, dry_run=dry_run, verbose=False)
+        return path, "fixed" if removed else "clean", removed, time.time() - start_time, None
+    except Exception as exc:
+        return path, "error", 0, time.time() - start_time, str(exc)
+
+
+def vrayFrameBufferFixBatch(paths, processes=None, dry_run=False, skip_clean=False, cache=True):
+    """ Remove the .vfbSA statements from many .ma files in parallel, without Maya.
+
+    :param paths: Paths or glob patterns of the maya ASCII files to fix.
+    :type  paths: list of str
+
+    :param processes: The amount of worker processes. None uses the amount of CPUs.
+    :type  processes: int or None
+
+    :param dry_run: If True only report what would be removed, don't change any files.
+    :type  dry_run: bool
+
+    :param skip_clean: If True quickly scan the bytes of each file first and skip files without any vfbSA.
+    :type  skip_clean: bool
+
+    :param cache: If True files that were clean or fixed by an earlier run (and didn't change since) are skipped
+                  without reading them, see `maFileCache.FileStateCache`.
+    :type  cache: bool
+
+    :rtype: list of tuple
+    :return: Per file (path, status, bytes removed, seconds, error message), the "cached" files first and the
+             others in the order they finished.
+    """
+    files = expandPaths(paths)
+    if not files:
+        return []
+
+    results = []
+    file_cache = FileStateCache() if cache else None
+    if file_cache is not None:
+        todo = []
+        for path in files:
+            if file_cache.lookup(path):
+                results.append((path, "cached", 0, 0.0, None))
+            else:
+                todo.append(path)
+        files = todo
+    if not files:
+        return results
+
+    tasks = [(path, dry_run, skip_clean) for path in files]
+    processes = min(processes or multiprocessing.cpu_count(), len(files))
+    pool = multiprocessing.Pool(processes)
+    try:
+        for result in pool.imap_unordered(_fixFile, tasks):
+            path, status, removed, duration, error = result
+            if status == "error":
+                print "{0}: ERROR {1}".format(path, error)
+            else:
+                print "{0}: {1}, {2} bytes {3} ({4:.2f} seconds)".format(
+                    path, status, removed, "would be removed" if dry_run else "removed", duration)
+                # A dry run leaves the files that need fixing as they are
+                if file_cache is not None and (status == "clean" or not dry_run):
+                    file_cache.record(path, CLEAN if status == "clean" else FIXED)
+            results.append(result)
+    finally:
+        pool.close()
+        pool.join()
+        if file_cache is not None:
+            file_cache.save()
+
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Remove the corrupt V-ray frame buffer settings (.vfbSA) "
+                                                 "from maya ASCII files without opening them in Maya.")
+    parser.add_argument("paths", nargs="+", help="Paths or glob patterns of (gzip compressed) .ma files")
+    parser.add_argument("-j", "--processes", type=int, default=None,
+                        help="Amount of worker processes (defaults to the amount of CPUs)")
+    parser.add_argument("-n", "--dry-run", action="store_true", help="Only report, don't change any files")
+    parser.add_argument("-s", "--skip-clean", action="store_true",
+                        help="Skip files that contain no vfbSA after a quick byte scan")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Don't skip (or remember) the files that were clean or fixed in an earlier run")
+    args = parser.parse_args(argv)
+
+    start_time = time.time()
+    results = vrayFrameBufferFixBatch(args.paths, processes=args.processes, dry_run=args.dry_run,
+                                      skip_clean=args.skip_clean, cache=not args.no_cache)
+    errors = [result for result in results if result[1] == "error"]
+    fixed = [result for result in results if result[1] == "fixed"]
+    cached = [result for result in results if result[1] == "cached"]
+    print "{0} files, {1} {2}, {3} unchanged since an earlier run, {4} errors, {5} bytes removed in {6:.2f} " \
+          "seconds".format(len(results), len(fixed), "need fixing" if args.dry_run else "fixed", len(cached),
+                           len(errors), sum(result[2] for result in results), time.time() - start_time)
+
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
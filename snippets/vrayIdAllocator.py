@@ -0,0 +1,219 @@
+import maya.cmds as mc
+import maya.mel as mel
+import collections
+import re
+
+from shadingEngineIndex import materialsFromNodes, shadingEngineIndex
+from shapeResolver import resolveShapes
+from undoPolicies import UNDO_CHUNK, undoPolicy
+from vrayAttributeGroups import addVrayAttributeGroup, setAttributeValues, uniqueNodeUuids
+from vrayAttributeIndex import groupValues, nodesWithGroup
+
+
+def _shortName(node):
+    return node.rsplit("|", 1)[-1]
+
+
+def _byNode(nodes):
+    return [_shortName(node) for node in nodes]
+
+
+def _byNamespace(nodes):
+    return [_shortName(node).rpartition(":")[0] or ":" for node in nodes]
+
+
+def _byAsset(nodes):
+    # The top level DAG node the node lives under (materials are their own asset)
+    return [node.split("|")[1] if node.startswith("|") else _shortName(node) for node in nodes]
+
+
+def _byShadingGroup(nodes):
+    shapes_index, materials_index = shadingEngineIndex()
+    uuids = mc.ls(nodes, uuid=True) or []
+    if len(uuids) != len(nodes):
+        uuids = [mc.ls(node, uuid=True)[0] for node in nodes]
+    # Shapes with per face assignments get a key of all their shading engines
+    return ["+".join(sorted(shapes_index.get(uuid, ()))) or "<unassigned>" for uuid in uuids]
+
+
+# The ways nodes can be grouped to share an ID, each maps a list of long node names to a key per node
+GROUPINGS = {
+    "node": _byNode,
+    "namespace": _byNamespace,
+    "asset": _byAsset,
+    "shadingGroup": _byShadingGroup,
+}
+
+
+def groupNodes(nodes, by="asset"):
+    """ Group nodes that should share an ID.
+
+    :param nodes: The long names of the nodes to group.
+    :type  nodes: list of str
+
+    :param by: One of the `GROUPINGS` ("node", "namespace", "asset" or "shadingGroup"), a naming rule as
+               regular expression whose first group is the key (eg. r"^(\\w+?)_") or a function that
+               returns the key for a node name.
+    :type  by: str or callable
+
+    :rtype: collections.OrderedDict
+    :return: Per key (in sorted order) the nodes of the group.
+    """
+    if callable(by):
+        keys = [by(node) for node in nodes]
+    elif by in GROUPINGS:
+        keys = GROUPINGS[by](nodes)
+    else:
+        regex = re.compile(by)
+        keys = []
+        for node in nodes:
+            match = regex.search(_shortName(node))
+            keys.append((match.group(1) if match.groups() else match.group(0)) if match else _shortName(node))
+
+    groups = {}
+    for key, node in zip(keys, nodes):
+        groups.setdefault(key, []).append(node)
+    return collections.OrderedDict(sorted(groups.items()))
+
+
+def multiMatteLayout(ids, unused):
+    """ Return the (red, green, blue) IDs of the MultiMatte render elements that cover the IDs.
+
+    Each MultiMatte element mattes three IDs, one per channel. Unused channels of the last element get the
+    `unused` ID, which must not be in use by any node (0 is the ID of all nodes without one) so they don't
+    matte anything.
+
+    :rtype: list of tuple
+    """
+    ids = sorted(ids)
+    ids += [unused] * (-len(ids) % 3)
+    return [tuple(ids[index:index + 3]) for index in range(0, len(ids), 3)]
+
+
+def allocateIds(groups, start=1, used=()):
+    """ Give each group the next ID from `start` on that isn't `used`, in the order of the groups.
+
+    The IDs fill the gaps between the used ones, so they stay as dense as possible.
+
+    :rtype: collections.OrderedDict
+    :return: Per group key its ID.
+    """
+    used = set(used)
+    ids = collections.OrderedDict()
+    value = start
+    for key in groups:
+        while value in used:
+            value += 1
+        ids[key] = value
+        value += 1
+    return ids
+
+
+def usedIds(group, attr, exclude=()):
+    """ Return the IDs set on the nodes in the scene that have the attribute group, see `vrayAttributeIndex`.
+
+    The values are read through the API, not with a getAttr per node.
+
+    :param exclude: The uuids of the nodes to leave out, eg. the ones that get a new ID.
+    :type  exclude: set of str
+
+    :rtype: set of int
+    """
+    nodes = [node for node, uuid in uniqueNodeUuids(nodesWithGroup(group)) if uuid not in exclude]
+    return set(values[0] for values in groupValues(nodes, [attr]))
+
+
+def _assignIds(nodes, group, attr, by, start, undo, verbose):
+    groups = groupNodes(nodes, by)
+    # The IDs other nodes already have are skipped, so no two groups end up sharing an ID
+    used = usedIds(group, attr, exclude=set(uuid for node, uuid in uniqueNodeUuids(nodes)))
+    ids = allocateIds(groups, start, used)
+    with undoPolicy(undo, name="assign_{0}".format(attr)):
+        addVrayAttributeGroup(nodes, group)
+        setAttributeValues([("{0}.{1}".format(node, attr), ids[key])
+                            for key, group_nodes in groups.items() for node in group_nodes])
+
+    layout = multiMatteLayout(ids.values(), max(used | set(ids.values())) + 1)
+    if verbose:
+        print "Assigned {0} {1}s to {2} nodes, this needs {3} MultiMatte render elements".format(
+            len(ids), attr, len(nodes), len(layout))
+    return {"ids": ids, "groups": groups, "elements": layout}
+
+
+def assignObjectIds(shapes=None, by="asset", start=1, undo=UNDO_CHUNK, verbose=True):
+    """ Assign compact object IDs automatically, one ID per group of shapes.
+
+    Instead of a typed in ID per selection (overlapping or sparse IDs) every group gets the next free ID
+    so the IDs pack into as few MultiMatte render elements (three IDs each) as possible. IDs in use by other
+    shapes in the scene are skipped.
+
+    :param shapes: The shapes (or their parents) to assign IDs to. If None the selection is used.
+    :type  shapes: list of str or None
+
+    :param by: How to group the shapes, see `groupNodes`.
+    :type  by: str or callable
+
+    :param start: The first ID to allocate from.
+    :type  start: int
+
+    :param undo: The undo policy, see `undoPolicies`.
+    :type  undo: str
+
+    :rtype: dict
+    :return: The "ids" per group key, the "groups" with their shapes and the (red, green, blue) IDs of the
+             MultiMatte render "elements" the assigned IDs need.
+    """
+    shapes = resolveShapes(shapes)
+    if not shapes:
+        raise RuntimeError("No shapes found to assign object IDs to.")
+    return _assignIds(shapes, "vray_objectID", "vrayObjectID", by, start, undo, verbose)
+
+
+def assignMaterialIds(materials=None, by="node", start=1, undo=UNDO_CHUNK, verbose=True):
+    """ Assign compact material IDs automatically, one ID per group of materials.
+
+    :param materials: The materials to assign IDs to. If None the selected materials and the materials
+                      assigned to the selection are used.
+    :type  materials: list of str or None
+
+    :param by: How to group the materials, see `groupNodes`.
+    :type  by: str or callable
+
+    :rtype: dict
+    :return: See `assignObjectIds`.
+    """
+    if materials is None:
+        materials = set(mc.ls(sl=1, mat=1) or [])
+        selection = mc.ls(sl=1)
+        if selection:
+            materials.update(materialsFromNodes(selection))
+        materials = sorted(materials)
+    else:
+        materials = mc.ls(materials, mat=1) or []
+    if not materials:
+        raise RuntimeError("No materials found to assign material IDs to.")
+    return _assignIds(materials, "vray_material_id", "vrayMaterialId", by, start, undo, verbose)
+
+
+def createMultiMatteElements(layout, material_ids=False, prefix="multiMatte"):
+    """ Create the MultiMatte render elements of a layout returned by `assignObjectIds`/`assignMaterialIds`.
+
+    :param layout: The (red, green, blue) IDs per render element.
+    :type  layout: list of tuple
+
+    :param material_ids: If True the elements matte material IDs instead of object IDs.
+    :type  material_ids: bool
+
+    :rtype: list of str
+    :return: The created render element nodes.
+    """
+    elements = []
+    for index, (red, green, blue) in enumerate(layout):
+        element = mel.eval("vrayAddRenderElement MultiMatteElement;")
+        setAttributeValues([("{0}.vray_name_multimatte".format(element), "{0}{1}".format(prefix, index + 1)),
+                            ("{0}.vray_redid_multimatte".format(element), red),
+                            ("{0}.vray_greenid_multimatte".format(element), green),
+                            ("{0}.vray_blueid_multimatte".format(element), blue),
+                            ("{0}.vray_usematid_multimatte".format(element), int(material_ids))])
+        elements.append(element)
+    return elements
@@ -0,0 +1,167 @@
+import maya.cmds as mc
+import gzip
+import json
+import time
+
+from undoPolicies import UNDO_CHUNK, undoPolicy
+from vrayAttributeGroups import addVrayAttributeGroup, setAttributeValues, uniqueNodeUuids
+from vrayAttributeIndex import checkGroup, groupIndex, groupValues
+from vrayCatalog import groupAttributes, groupDefaults
+
+
+# Bump when the layout of the manifest changes
+MANIFEST_FORMAT = 1
+
+
+def _open(path, mode):
+    return gzip.open(path, mode) if path.endswith(".gz") else open(path, mode)
+
+
+def _flatten(value):
+    """ Compound values come back from getAttr as [(r, g, b)] and from json as [[r, g, b]]. """
+    if isinstance(value, (list, tuple)):
+        return [item for part in value for item in _flatten(part)]
+    return [value]
+
+
+def exportManifest(path, groups=None, verbose=True):
+    """ Write the V-ray attribute groups and their values of all nodes in the scene to a manifest.
+
+    The nodes are keyed by uuid, with their long name as fallback for when the uuid changed (eg. after a
+    rebuild). Per group the attribute names are stored once and every node only has its values:
+
+        {"format": 1, "groups": {"vray_objectID": {"attributes": ["vrayObjectID"],
+                                                   "nodes": [[uuid, long name, [values]], ...]}}}
+
+    A path ending with .gz is written gzip compressed.
+
+    :param path: The manifest file path (.json or .json.gz).
+    :type  path: str
+
+    :param groups: The attribute groups to export, by default all groups in the scene.
+    :type  groups: list of str or None
+
+    :rtype: int
+    :return: The amount of node entries written.
+    """
+    start_time = time.time()
+    index = groupIndex()
+    manifest = {"format": MANIFEST_FORMAT, "scene": mc.file(query=True, sceneName=True), "groups": {}}
+    count = 0
+    for group in sorted(groups or index):
+        uuids = index.get(group)
+        if not uuids:
+            continue
+        attributes = groupAttributes(group)
+        # Leave out the nodes another tool removed the group from since the index saw them
+        found = uniqueNodeUuids(list(uuids))
+        has_group = checkGroup(group, found)
+        found = [(node, uuid) for node, uuid in found if uuid in has_group]
+        # All values are read in one go through the API, not with a getAttr per plug
+        values = groupValues([node for node, uuid in found], attributes)
+        nodes = [[uuid, node, node_values] for (node, uuid), node_values in zip(found, values)]
+        manifest["groups"][group] = {"attributes": attributes, "nodes": nodes}
+        count += len(nodes)
+
+    with _open(path, "wb") as f:
+        json.dump(manifest, f, separators=(",", ":"))
+
+    if verbose:
+        print "Exported {0} node entries to {1} in {2:.2f} seconds".format(count, path, time.time() - start_time)
+    return count
+
+
+def _resolveNodes(entries):
+    """ Map the manifest entries (uuid, long name) to the (long name, uuid) of the node in the scene.
+
+    Uuids are looked up first, the entries whose uuid isn't in the scene fall back to their long name.
+    """
+    resolved = {}
+    uuids = set(uuid for uuid, name in entries)
+    for node, uuid in uniqueNodeUuids(list(uuids)):
+        resolved[uuid] = (node, uuid)
+
+    missing = [name for uuid, name in entries if uuid not in resolved]
+    if missing:
+        by_name = dict((node, (node, uuid)) for node, uuid in uniqueNodeUuids(missing))
+        for uuid, name in entries:
+            if uuid not in resolved and name in by_name:
+                resolved[uuid] = by_name[name]
+    return resolved
+
+
+def importManifest(path, undo=UNDO_CHUNK, dry_run=False, verbose=True):
+    """ Reapply the V-ray attribute groups and values of a manifest, see `exportManifest`.
+
+    Only the differences are applied: groups are added in batches to the nodes that lack them and only values
+    that differ from the scene are set (in MEL batches). The current values are read in bulk through the API.
+    Nodes are found by uuid, or else by long name.
+
+    :param path: The manifest file path.
+    :type  path: str
+
+    :param undo: The undo policy, see `undoPolicies`.
+    :type  undo: str
+
+    :param dry_run: If True only count the differences, don't change the scene.
+    :type  dry_run: bool
+
+    :rtype: dict
+    :return: The amount of node entries "missing" from the scene, the "added" groups, the values "set"
+             and the "unchanged" values.
+    """
+    start_time = time.time()
+    with _open(path, "rb") as f:
+        manifest = json.load(f)
+    if manifest.get("format") != MANIFEST_FORMAT:
+        raise ValueError("Unsupported manifest format: {0}".format(manifest.get("format")))
+
+    entries = set((uuid, name) for data in manifest["groups"].values() for uuid, name, values in data["nodes"])
+    resolved = _resolveNodes(list(entries))
+
+    counts = {"missing": 0, "added": 0, "set": 0, "unchanged": 0}
+    with undoPolicy(undo, name="importManifest"):
+        for group, data in sorted(manifest["groups"].items()):
+            found = []
+            for uuid, name, values in data["nodes"]:
+                if uuid in resolved:
+                    found.append((resolved[uuid], values))
+                else:
+                    counts["missing"] += 1
+            has_group = checkGroup(group, [node for node, values in found])
+            defaults = groupDefaults(group)
+            lacking = []
+            plug_values = []
+            present = []
+            for (node, node_uuid), values in found:
+                if node_uuid not in has_group:
+                    # Once the group is added only the values that differ from its defaults have to be set
+                    lacking.append(node)
+                    for attr, value in zip(data["attributes"], values):
+                        if attr in defaults and _flatten(defaults[attr]) == _flatten(value):
+                            counts["unchanged"] += 1
+                        else:
+                            plug_values.append(("{0}.{1}".format(node, attr), value))
+                    continue
+                present.append((node, values))
+
+            # The current values of the nodes that have the group, read in one go through the API
+            current = groupValues([node for node, values in present], data["attributes"])
+            for (node, values), node_current in zip(present, current):
+                for attr, value, current_value in zip(data["attributes"], values, node_current):
+                    if _flatten(current_value) == _flatten(value):
+                        counts["unchanged"] += 1
+                    else:
+                        plug_values.append(("{0}.{1}".format(node, attr), value))
+
+            counts["added"] += len(lacking)
+            counts["set"] += len(plug_values)
+            if not dry_run:
+                if lacking:
+                    addVrayAttributeGroup(lacking, group)
+                setAttributeValues(plug_values)
+
+    if verbose:
+        print "Imported {0}: {1} groups added, {2} values set, {3} unchanged, {4} missing ({5:.2f} seconds)".format(
+            path, counts["added"], counts["set"], counts["unchanged"], counts["missing"], time.time() - start_time)
+    return counts
@@ -0,0 +1,194 @@
+import argparse
+import sys
+import time
+
+from maSceneFile import findSettingsArrays, removeVfbSA
+from vrayFrameBufferFixBatch import expandPaths
+
+
+# Arrays with more elements than this are reported as bloated. A healthy .vfbSA holds a few thousand values,
+# the corrupt ones run into the hundreds of thousands or millions.
+LIMIT = 50000
+
+# The arrays that can be compacted and their known-good minimum: empty makes V-ray fall back to its defaults
+COMPACT = {"vfbSA": []}
+
+# Per data array type (of `getAttr -type`) the API function set that reads its length
+_ARRAY_DATA = {"Int32Array": "MFnIntArrayData", "doubleArray": "MFnDoubleArrayData",
+               "stringArray": "MFnStringArrayData", "vectorArray": "MFnVectorArrayData",
+               "pointArray": "MFnPointArrayData"}
+
+# Maya is only imported by the functions working on the open scene, files can be audited with plain Python.
+# Per node type the (name, type) of its data array attributes, they're looked up once per session
+_array_attributes = {}
+# The save callback of `installSaveHook`
+_callbacks = []
+
+
+def arrayAttributes(settings="vraySettings"):
+    """ Return the names of the data array attributes (eg. Int32Array) of the V-ray settings node.
+
+    The attributes are found once per node type (it has many attributes), later calls cost no commands.
+
+    :rtype: list of str
+    """
+    return [attr for attr, attr_type in _arrayAttributeTypes(settings)]
+
+
+def _arrayAttributeTypes(settings):
+    import maya.cmds as mc
+    node_type = mc.nodeType(settings)
+    if node_type not in _array_attributes:
+        attributes = []
+        for attr in mc.listAttr(settings) or []:
+            try:
+                attr_type = mc.getAttr("{0}.{1}".format(settings, attr), type=True)
+            except (RuntimeError, ValueError):
+                continue
+            if attr_type and attr_type.endswith("Array"):
+                attributes.append((attr, attr_type))
+        _array_attributes[node_type] = attributes
+    return _array_attributes[node_type]
+
+
+def arrayLength(settings, attr, attr_type):
+    """ Return the amount of elements of a data array attribute, read through the API.
+
+    `getAttr -size` is the size of a multi attribute (1 for a data array) and `getAttr` would copy all the
+    values into Python just to count them.
+
+    :param attr_type: The data type of the attribute as `getAttr -type` returns it, eg. "Int32Array".
+    :type  attr_type: str
+
+    :rtype: int
+    """
+    import maya.api.OpenMaya as om
+    selection = om.MSelectionList()
+    selection.add(settings)
+    plug = om.MFnDependencyNode(selection.getDependNode(0)).findPlug(attr, False)
+    function_set = _ARRAY_DATA.get(attr_type)
+    if function_set is None:
+        import maya.cmds as mc
+        return len(mc.getAttr(plug.name()) or [])
+    data = plug.asMObject()
+    # An array that was never set has no data
+    return 0 if data.isNull() else len(getattr(om, function_set)(data))
+
+
+def auditSettings(settings="vraySettings"):
+    """ Return the size of each data array on the V-ray settings node of the open scene, largest first.
+
+    :rtype: list of (str, int)
+    :return: The (attribute, amount of elements) pairs. Empty if there's no settings node.
+    """
+    import maya.cmds as mc
+    if not mc.objExists(settings):
+        return []
+    sizes = []
+    for attr, attr_type in _arrayAttributeTypes(settings):
+        sizes.append((attr, arrayLength(settings, attr, attr_type)))
+    return sorted(sizes, key=lambda pair: -pair[1])
+
+
+def compactSettings(settings="vraySettings", limit=LIMIT, verbose=True):
+    """ Reset the arrays of `COMPACT` on the V-ray settings node that grew beyond `limit` elements.
+
+    Only the `COMPACT` arrays are looked at and only their length is read (`arrayLength`), the values of a
+    healthy array aren't copied into Python, so it can run on every save.
+
+    :rtype: list of (str, int)
+    :return: The (attribute, amount of elements before) of the compacted arrays.
+    """
+    import maya.cmds as mc
+    if not mc.objExists(settings):
+        return []
+    compacted = []
+    for attr, minimum in sorted(COMPACT.items()):
+        if not mc.attributeQuery(attr, node=settings, exists=True):
+            continue
+        plug = "{0}.{1}".format(settings, attr)
+        attr_type = mc.getAttr(plug, type=True)
+        size = arrayLength(settings, attr, attr_type)
+        if size <= limit or mc.getAttr(plug, lock=True):
+            continue
+        mc.setAttr(plug, minimum, type=attr_type)
+        compacted.append((attr, size))
+        if verbose:
+            print "Compacted {0} from {1} elements".format(plug, size)
+    return compacted
+
+
+def _onBeforeSave(client_data):
+    settings, limit, verbose = client_data
+    try:
+        compactSettings(settings, limit, verbose)
+    except Exception as exc:
+        # Never block (or break) a save, whatever went wrong
+        print "Couldn't compact {0}: {1}".format(settings, exc)
+
+
+def installSaveHook(settings="vraySettings", limit=LIMIT, verbose=True):
+    """ Compact the bloated V-ray settings arrays right before every save, so the bloat never builds up.
+
+    See `compactSettings`, remove the hook with `uninstall`.
+    """
+    import maya.api.OpenMaya as om
+    uninstall()
+    _callbacks.append(om.MSceneMessage.addCallback(om.MSceneMessage.kBeforeSave, _onBeforeSave,
+                                                   (settings, limit, verbose)))
+
+
+def uninstall():
+    """ Remove the save hook. """
+    import maya.api.OpenMaya as om
+    for callback in _callbacks:
+        om.MMessage.removeCallback(callback)
+    del _callbacks[:]
+
+
+def compactMaFile(path, limit=LIMIT, dry_run=False):
+    """ Remove the arrays of `COMPACT` with more than `limit` elements from a .ma file.
+
+    Only .vfbSA can be compacted in a file: its statement is removed, V-ray then uses its defaults.
+
+    :rtype: int
+    :return: The amount of bytes removed.
+    """
+    if not any(attr in COMPACT and size > limit for attr, size, length in findSettingsArrays(path)):
+        return 0
+    return removeVfbSA(path, dry_run=dry_run, verbose=False)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report the size of the V-ray settings arrays (like the frame "
+                                                 "buffer settings .vfbSA) in maya ASCII files and compact them.")
+    parser.add_argument("paths", nargs="+", help="Paths or glob patterns of (gzip compressed) .ma files")
+    parser.add_argument("-l", "--limit", type=int, default=LIMIT,
+                        help="Report (and compact) arrays with more elements than this")
+    parser.add_argument("-c", "--compact", action="store_true", help="Compact the bloated arrays")
+    args = parser.parse_args(argv)
+
+    start_time = time.time()
+    bloated = 0
+    errors = 0
+    for path in expandPaths(args.paths):
+        try:
+            arrays = findSettingsArrays(path)
+        except (IOError, OSError) as exc:
+            print "{0}: ERROR {1}".format(path, exc)
+            errors += 1
+            continue
+        over = [array for array in arrays if array[1] > args.limit]
+        bloated += bool(over)
+        print "{0}: {1}".format(path, ", ".join("{0} {1} elements ({2:.1f} KB)".format(attr, size, length / 1024.0)
+                                               for attr, size, length in arrays) or "no arrays")
+        if over and args.compact:
+            print "    compacted, {0} bytes removed".format(compactMaFile(path, args.limit))
+
+    print "{0} files with bloated arrays, {1} errors in {2:.2f} seconds".format(bloated, errors,
+                                                                               time.time() - start_time)
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -146,3 +146,11 @@ if nodes:
 # Simple as that!
 # To make sure you understand correctly try adding the ``vray_skip_export`` to selected transform nodes.
 # Then maybe try adding ``vray_objectID`` attributes to all children shapes of your selection. :)
+
+# Once you have more than a few of these naming conventions have a look at ``snippets/vrayAttributeRules.py``.
+# It takes a table of (pattern, shape type, attribute group, values) rules and applies them all with a single
+# listing of the scene instead of an ``mc.ls`` for every pattern:
+#
+#   from vrayAttributeRules import applyAttributeRules
+#   applyAttributeRules([("*_SMOOTH", "mesh", "vray_subdivision", None),
+#                        ("*_EXTREMELY_RENDERABLE_CURVE", "nurbsCurve", "vray_nurbscurve_renderable", None)])